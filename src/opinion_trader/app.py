@@ -24,6 +24,8 @@ def main():
 
 def run_daemon():
     """以守护进程模式运行"""
+    # 先 fork 再导入交易模块: daemon 模块不依赖 rich/SDK，两次 fork 时进程堆还很小，
+    # 交易相关的重量级依赖只在最终的守护进程里由 main() 加载
     from opinion_trader.utils.daemon import DaemonProcess
     DaemonProcess.daemonize()
     main()
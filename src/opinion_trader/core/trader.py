@@ -49,6 +49,7 @@ from opinion_trader.services.services import (
     UserConfirmation,
     handle_insufficient_balance,
 )
+from opinion_trader.utils.helpers import format_price, translate_error
 from opinion_trader.utils.console import (
     ask,
     ask_float,
@@ -75,7 +76,7 @@ from opinion_trader.utils.console import (
     table,
     warning,
 )
-from opinion_trader.websocket.client import OpinionWebSocket, WebSocketMonitor
+from opinion_trader.websocket.client import OpinionWebSocket, WebSocketMonitor, run_async
 
 
 class DaemonProcess:
@@ -83,6 +84,7 @@ class DaemonProcess:
 
     PID_FILE = "/tmp/opinion_trade.pid"
     LOG_FILE = "opinion_trade.log"
+    LOG_FILE_ABS = os.path.abspath(LOG_FILE)  # 状态输出用，类加载时解析一次
 
     @classmethod
     def is_running(cls) -> tuple:
@@ -102,63 +104,113 @@ class DaemonProcess:
 
     @classmethod
     def _remove_pid_file(cls):
-        """删除PID文件"""
-        try:
-            if os.path.exists(cls.PID_FILE):
-                os.remove(cls.PID_FILE)
-        except:
-            pass
+        """删除PID文件及其锁文件"""
+        for path in (cls.PID_FILE, cls.PID_FILE + ".lock"):
+            try:
+                if os.path.exists(path):
+                    os.remove(path)
+            except:
+                pass
 
     @classmethod
     def _write_pid_file(cls):
-        """写入PID文件"""
-        with open(cls.PID_FILE, 'w') as f:
-            f.write(str(os.getpid()))
+        """写入PID文件
+
+        认领过程持有独立锁文件上的 flock，两个守护进程同时启动时串行执行；
+        PID 先写入临时文件再 rename 到位，PID文件不会出现空内容的中间状态。
+        """
+        import fcntl  # 仅 POSIX，只在 daemonize 路径上导入
+
+        lock_file = cls.PID_FILE + ".lock"
+        while True:
+            lock_fd = os.open(lock_file, os.O_WRONLY | os.O_CREAT | os.O_CLOEXEC, 0o644)
+            fcntl.flock(lock_fd, fcntl.LOCK_EX)
+            # 锁文件可能在等待期间被 _remove_pid_file 删除，确认锁住的仍是路径上的那个文件
+            try:
+                if os.fstat(lock_fd).st_ino == os.stat(lock_file).st_ino:
+                    break
+            except FileNotFoundError:
+                pass
+            os.close(lock_fd)
+
+        try:
+            # 读取已有的PID文件 (内容无效时不删除，交给用户确认)
+            try:
+                with open(cls.PID_FILE, 'r') as f:
+                    pid = int(f.read().strip())
+            except FileNotFoundError:
+                pid = None
+            except (OSError, ValueError):
+                error(f"PID文件 {cls.PID_FILE} 内容无效，确认没有守护进程在运行后请手动删除")
+                sys.exit(1)
+
+            if pid is not None and pid != os.getpid():
+                try:
+                    os.kill(pid, 0)
+                    alive = True
+                except ProcessLookupError:
+                    alive = False
+                except PermissionError:
+                    alive = True  # 进程存在，只是属于其他用户
+                if alive:
+                    error(f"已有守护进程在运行 (PID: {pid})")
+                    sys.exit(1)
+
+            tmp_file = f"{cls.PID_FILE}.{os.getpid()}.tmp"
+            with open(tmp_file, 'w') as f:
+                f.write(str(os.getpid()))
+            os.replace(tmp_file, cls.PID_FILE)
+        except OSError as e:
+            error(f"写入PID文件失败: {e}")
+            sys.exit(1)
+        finally:
+            os.close(lock_fd)
 
     @classmethod
     def stop_daemon(cls) -> bool:
         """停止守护进程"""
+        from opinion_trader.utils.daemon import open_pidfd, send_signal, wait_for_exit
+
         running, pid = cls.is_running()
-        if not running:
+        if not running or pid is None:
             print("没有运行中的守护进程")
             return False
 
+        pidfd = open_pidfd(pid)
         try:
             print(f"正在停止守护进程 (PID: {pid})...")
-            os.kill(pid, signal.SIGTERM)
-            # 等待进程结束
-            for _ in range(10):
-                time.sleep(0.5)
-                try:
-                    os.kill(pid, 0)
-                except OSError:
-                    success("守护进程已停止")
-                    cls._remove_pid_file()
-                    return True
-            # 强制杀死
-            os.kill(pid, signal.SIGKILL)
-            success("守护进程已强制停止")
+            send_signal(pid, pidfd, signal.SIGTERM)
+            # 等待进程结束，最多 5 秒
+            if wait_for_exit(pid, pidfd, 5.0):
+                success("守护进程已停止")
+            else:
+                # 强制杀死
+                send_signal(pid, pidfd, signal.SIGKILL)
+                success("守护进程已强制停止")
             cls._remove_pid_file()
             return True
         except Exception as e:
             error(f"停止失败: {e}")
             return False
+        finally:
+            if pidfd is not None:
+                os.close(pidfd)
 
     @classmethod
     def status(cls):
         """显示守护进程状态"""
+        from opinion_trader.utils.daemon import tail_lines
+
         running, pid = cls.is_running()
         if running:
             success(f"守护进程运行中 (PID: {pid})")
-            print(f"  日志文件: {os.path.abspath(cls.LOG_FILE)}")
+            print(f"  日志文件: {cls.LOG_FILE_ABS}")
             # 显示最后几行日志
             if os.path.exists(cls.LOG_FILE):
                 print("\n  最近日志:")
                 try:
-                    with open(cls.LOG_FILE, 'r') as f:
-                        lines = f.readlines()
-                        for line in lines[-10:]:
-                            print(f"  {line.rstrip()}")
+                    for line in tail_lines(cls.LOG_FILE, 10):
+                        print(f"  {line.rstrip()}")
                 except:
                     pass
         else:
@@ -180,7 +232,7 @@ class DaemonProcess:
             if pid > 0:
                 # 父进程退出
                 success(f"守护进程已启动")
-                print(f"  日志文件: {os.path.abspath(cls.LOG_FILE)}")
+                print(f"  日志文件: {cls.LOG_FILE_ABS}")
                 print(f"  查看状态: python trade.py status")
                 print(f"  停止进程: python trade.py stop")
                 sys.exit(0)
@@ -203,15 +255,17 @@ class DaemonProcess:
         sys.stdout.flush()
         sys.stderr.flush()
 
-        # 打开日志文件和/dev/null
+        # 打开日志文件和/dev/null (直接使用系统级 fd，dup2 后即关闭原 fd)
         try:
-            dev_null = open('/dev/null', 'r+')
-            log_file = open(cls.LOG_FILE, 'a', buffering=1)
-
-            # 重定向 - 使用文件描述符数字而非 fileno()
-            os.dup2(dev_null.fileno(), 0)  # stdin
-            os.dup2(log_file.fileno(), 1)  # stdout
-            os.dup2(log_file.fileno(), 2)  # stderr
+            dev_null = os.open(os.devnull, os.O_RDWR | os.O_CLOEXEC)
+            log_fd = os.open(cls.LOG_FILE, os.O_WRONLY | os.O_CREAT | os.O_APPEND | os.O_CLOEXEC, 0o644)
+
+            # 重定向
+            os.dup2(dev_null, 0)  # stdin
+            os.dup2(log_fd, 1)  # stdout
+            os.dup2(log_fd, 2)  # stderr
+            os.close(dev_null)
+            os.close(log_fd)
         except Exception as e:
             # 如果重定向失败，尝试继续运行
             pass
@@ -223,12 +277,27 @@ class DaemonProcess:
         atexit.register(cls._remove_pid_file)
 
         # 处理终止信号
-        def signal_handler(signum, frame):
-            print(f"\n[{datetime.now().strftime('%H:%M:%S')}] 收到终止信号，正在退出...")
-            sys.exit(0)
+        signal.signal(signal.SIGTERM, _term_handler)
+        signal.signal(signal.SIGINT, _term_handler)
+
 
-        signal.signal(signal.SIGTERM, signal_handler)
-        signal.signal(signal.SIGINT, signal_handler)
+def _term_handler(signum, frame):
+    """守护进程的终止信号处理
+
+    不抛 SystemExit (信号可能打断正在进行的 IO，完整的解释器清理有卡住的风险)：
+    尽力刷新缓冲后直接写 fd 1，删除PID文件，再 os._exit 退出。
+    """
+    for stream in (sys.stdout, sys.stderr):
+        try:
+            stream.flush()
+        except Exception:
+            pass
+    try:
+        os.write(1, f"\n[{datetime.now().strftime('%H:%M:%S')}] 收到终止信号，正在退出...\n".encode())
+    except OSError:
+        pass
+    DaemonProcess._remove_pid_file()
+    os._exit(0)
 
 
 # 从拆分的模块导入
@@ -264,53 +333,7 @@ class OpinionSDKTrader:
 
     def translate_error(self, errmsg: str) -> str:
         """翻译常见错误信息"""
-        if not errmsg:
-            return "未知错误"
-
-        # 最低金额错误
-        import re
-        min_value_match = re.search(
-            r'Order value ([\d.]+) USDT is below the minimum required value of ([\d.]+) USDT', errmsg)
-        if min_value_match:
-            actual = min_value_match.group(1)
-            required = min_value_match.group(2)
-            return f"金额${actual}低于最低要求${required}"
-
-        # 余额不足
-        if 'insufficient' in errmsg.lower() or 'balance' in errmsg.lower():
-            return "余额不足"
-
-        # 地区限制
-        if 'region' in errmsg.lower() or 'country' in errmsg.lower() or 'restricted' in errmsg.lower():
-            return "地区限制"
-
-        # 订单不存在
-        if 'order not found' in errmsg.lower():
-            return "订单不存在"
-
-        # 市场已关闭
-        if 'market' in errmsg.lower() and ('closed' in errmsg.lower() or 'resolved' in errmsg.lower()):
-            return "市场已关闭"
-
-        # 价格超出范围
-        if 'price' in errmsg.lower() and ('invalid' in errmsg.lower() or 'range' in errmsg.lower()):
-            return "价格无效"
-
-        # 数量错误
-        if 'quantity' in errmsg.lower() or 'shares' in errmsg.lower():
-            if 'minimum' in errmsg.lower():
-                return "数量低于最小要求"
-            elif 'maximum' in errmsg.lower():
-                return "数量超过最大限制"
-
-        # 网络错误
-        if 'timeout' in errmsg.lower() or 'connection' in errmsg.lower():
-            return "网络超时"
-
-        # 如果没有匹配，返回原始消息（但截断过长的消息）
-        if len(errmsg) > 50:
-            return errmsg[:47] + "..."
-        return errmsg
+        return translate_error(errmsg)
 
     def check_balance_sufficient(self, client, config, required_amount: float) -> tuple:
         """检查余额是否足够
@@ -519,13 +542,9 @@ class OpinionSDKTrader:
             市场ID，返回0表示取消
         """
         # 如果市场列表还没加载完成，等待一下
-        import time as _time
-        wait_count = 0
-        while not MarketListService.is_loaded() and wait_count < 10:
-            if wait_count == 0:
-                info("正在获取市场列表...")
-            _time.sleep(0.5)
-            wait_count += 1
+        if not MarketListService.is_loaded():
+            info("正在获取市场列表...")
+            MarketListService.wait_until_loaded(timeout=5)
 
         # 获取市场列表
         markets = MarketListService.get_recent_markets(max_count=15)
@@ -767,12 +786,7 @@ class OpinionSDKTrader:
 
     def format_price(self, price):
         """格式化价格显示（*100并去掉小数点后多余的0）"""
-        # 先四舍五入到0.1分精度，避免浮点数精度问题
-        price_cent = round(price * 100, 1)
-        if price_cent == int(price_cent):
-            return f"{int(price_cent)}"
-        else:
-            return f"{price_cent:.1f}"
+        return format_price(price)
 
     def get_all_positions(self, client, market_id=0):
         """获取所有持仓（自动翻页）"""
@@ -882,8 +896,8 @@ class OpinionSDKTrader:
     def get_sell_prices_reference(self, client, token_id):
         """获取卖1到卖5的价格参考"""
         ob = OrderbookService.fetch(client, token_id)
-        if ob['success']:
-            return [(i + 1, price) for i, (price, _) in enumerate(ob['asks'][:5])]
+        if ob.success:
+            return [(i + 1, price) for i, (price, _) in enumerate(ob.asks[:5])]
         return []
 
     def execute_quick_mode(self, client, config, market_id, token_id, selected_token_name, total_trades, min_amount, max_amount):
@@ -893,20 +907,20 @@ class OpinionSDKTrader:
         # 获取盘口数据并检查流动性
         print(f"\n正在获取盘口信息...")
         ob = OrderbookService.fetch(client, token_id)
-        if not ob['success']:
-            error(f"无法获取盘口数据: {ob.get('error', '')}")
+        if not ob.success:
+            error(f"无法获取盘口数据: {ob.error or ''}")
             return
 
-        if not ob['bids'] or not ob['asks']:
+        if not ob.bids or not ob.asks:
             error(f"买盘或卖盘为空")
             return
 
-        bid_depth = ob['bid_depth']
-        ask_depth = ob['ask_depth']
+        bid_depth = ob.bid_depth
+        ask_depth = ob.ask_depth
 
         # 显示盘口信息
         OrderbookDisplay.show(
-            ob['bids'], ob['asks'],
+            ob.bids, ob.asks,
             mode=OrderbookDisplay.MODE_WITH_DEPTH,
             max_rows=5,
             format_price_func=self.format_price
@@ -1028,13 +1042,13 @@ class OpinionSDKTrader:
                 # 获取卖1价格
                 try:
                     ob = OrderbookService.fetch(client, token_id)
-                    if not ob['success'] or not ob['asks']:
+                    if not ob.success or not ob.asks:
                         error(f"无法获取盘口数据，重试...")
                         i += 1
                         time.sleep(2)
                         continue
 
-                    price = ob['ask1_price']
+                    price = ob.ask1_price
                     print(f"  使用价格: {self.format_price(price)}¢ (卖1)")
 
                     # 执行买入（限价单）
@@ -1156,13 +1170,13 @@ class OpinionSDKTrader:
 
                     # 获取买1价格
                     ob = OrderbookService.fetch(client, token_id)
-                    if not ob['success'] or not ob['bids']:
+                    if not ob.success or not ob.bids:
                         error(f"无法获取盘口数据，重试...")
                         i += 1
                         time.sleep(2)
                         continue
 
-                    price = ob['bid1_price']
+                    price = ob.bid1_price
                     print(f"  使用价格: {self.format_price(price)}¢ (买1)")
 
                     # 执行卖出（限价单，全仓）
@@ -1356,19 +1370,19 @@ class OpinionSDKTrader:
         # 获取盘口数据并检查流动性
         print(f"\n正在获取盘口信息...")
         ob = OrderbookService.fetch(client, token_id)
-        if not ob['success']:
-            error(f"无法获取盘口数据: {ob.get('error', '')}")
+        if not ob.success:
+            error(f"无法获取盘口数据: {ob.error or ''}")
             return
 
-        if not ob['bids'] or not ob['asks']:
+        if not ob.bids or not ob.asks:
             error(f"买盘或卖盘为空")
             return
 
-        ask_depth = ob['ask_depth']
+        ask_depth = ob.ask_depth
 
         # 显示盘口信息
         OrderbookDisplay.show(
-            ob['bids'], ob['asks'],
+            ob.bids, ob.asks,
             mode=OrderbookDisplay.MODE_WITH_DEPTH,
             max_rows=5,
             format_price_func=self.format_price
@@ -1427,11 +1441,11 @@ class OpinionSDKTrader:
             # 获取卖1价格
             try:
                 ob = OrderbookService.fetch(client, token_id)
-                if not ob['success'] or not ob['asks']:
+                if not ob.success or not ob.asks:
                     error(f"无法获取盘口数据")
                     continue
 
-                price = ob['ask1_price']
+                price = ob.ask1_price
                 print(f"  价格: {self.format_price(price)}¢ (卖1)")
 
                 # 执行买入（限价单）
@@ -3925,10 +3939,10 @@ class OpinionSDKTrader:
 
                     # 获取买1价格
                     ob = OrderbookService.fetch(client, token_id)
-                    if not ob['success'] or not ob['bids']:
+                    if not ob.success or not ob.bids:
                         error("无买盘，无法挂卖")
                         return
-                    sell_price = ob['bid1_price']
+                    sell_price = ob.bid1_price
                     print(f"\n买1价格: {self.format_price(sell_price)}¢")
 
                     # 检测成本价，判断是否可能亏损
@@ -3981,10 +3995,10 @@ class OpinionSDKTrader:
         # 5. 获取当前盘口信息
         print(f"\n正在获取盘口信息...")
         ob = OrderbookService.fetch(client, token_id)
-        if ob['success']:
+        if ob.success:
             # 显示盘口信息
             OrderbookDisplay.show(
-                ob['bids'][:5], ob['asks'][:5],
+                ob.bids[:5], ob.asks[:5],
                 mode=OrderbookDisplay.MODE_SIMPLE,
                 max_rows=5,
                 show_summary=False,
@@ -3993,19 +4007,19 @@ class OpinionSDKTrader:
 
             # 提示当前价格
             if is_buy:
-                if ob['ask1_price'] > 0:
+                if ob.ask1_price > 0:
                     print(
-                        f"\n  [*] 买入提示: 卖1价格 {self.format_price(ob['ask1_price'])}¢ 可立即成交")
-                if ob['bid1_price'] > 0:
+                        f"\n  [*] 买入提示: 卖1价格 {self.format_price(ob.ask1_price)}¢ 可立即成交")
+                if ob.bid1_price > 0:
                     print(
-                        f"  [*] 挂单提示: 低于买1价格 {self.format_price(ob['bid1_price'])}¢ 需等待成交")
+                        f"  [*] 挂单提示: 低于买1价格 {self.format_price(ob.bid1_price)}¢ 需等待成交")
             else:
-                if ob['bid1_price'] > 0:
+                if ob.bid1_price > 0:
                     print(
-                        f"\n  [*] 卖出提示: 买1价格 {self.format_price(ob['bid1_price'])}¢ 可立即成交")
-                if ob['ask1_price'] > 0:
+                        f"\n  [*] 卖出提示: 买1价格 {self.format_price(ob.bid1_price)}¢ 可立即成交")
+                if ob.ask1_price > 0:
                     print(
-                        f"  [*] 挂单提示: 高于卖1价格 {self.format_price(ob['ask1_price'])}¢ 需等待成交")
+                        f"  [*] 挂单提示: 高于卖1价格 {self.format_price(ob.ask1_price)}¢ 需等待成交")
         else:
             warning(f"获取盘口失败，继续...")
 
@@ -5130,9 +5144,9 @@ class OpinionSDKTrader:
             max_rows=10,
             format_price_func=self.format_price
         )
-        if ob['success']:
-            bid1_price = ob['bid1_price']
-            ask1_price = ob['ask1_price']
+        if ob.success:
+            bid1_price = ob.bid1_price
+            ask1_price = ob.ask1_price
 
         return (bid1_price, ask1_price)
 
@@ -5800,8 +5814,8 @@ class OpinionSDKTrader:
         print(f"  正在获取初始盘口快照 (token_id={config.token_id})...")
         client = self.clients[account_indices[0] - 1]
         ob = OrderbookService.fetch(client, config.token_id)
-        if ob['success'] and ob.get('raw'):
-            orderbook = ob['raw']
+        if ob.success and ob.raw:
+            orderbook = ob.raw
             with shared_orderbook['lock']:
                 # 初始化买盘
                 if orderbook.bids:
@@ -5818,7 +5832,7 @@ class OpinionSDKTrader:
                 else:
                     warning(f"盘口为空 (买0档, 卖0档)")
         else:
-            error_msg = ob.get('error', '未知错误')
+            error_msg = ob.error or '未知错误'
             warning(f"获取初始盘口失败: {error_msg}")
 
         # 启动所有做市线程
@@ -6457,7 +6471,7 @@ class OpinionSDKTrader:
     def _mm_get_orderbook(self, client, token_id: str):
         """获取盘口数据"""
         ob = OrderbookService.fetch(client, token_id)
-        return ob.get('raw') if ob['success'] else None
+        return ob.raw if ob.success else None
 
     def _mm_get_order_status(self, client, order_id: str):
         """获取订单状态"""
@@ -8430,9 +8444,9 @@ class OpinionSDKTrader:
         # 查询当前盘口价格
         print(f"\n正在获取当前盘口...")
         ob = OrderbookService.fetch(client, token_id)
-        if ob['success']:
-            ask1_price = ob['ask1_price']
-            bid1_price = ob['bid1_price']
+        if ob.success:
+            ask1_price = ob.ask1_price
+            bid1_price = ob.bid1_price
             print(f"  卖1价(买入用): {self.format_price(ask1_price)}¢")
             print(f"  买1价(卖出用): {self.format_price(bid1_price)}¢")
         else:
@@ -8886,8 +8900,8 @@ class OpinionSDKTrader:
             if price is None:
                 # 获取卖1价
                 ob = OrderbookService.fetch(client, token_id)
-                if ob['success'] and ob['ask1_price'] > 0:
-                    price = ob['ask1_price']
+                if ob.success and ob.ask1_price > 0:
+                    price = ob.ask1_price
                 else:
                     error(f"[{config.remark}] 买入#{op_num}: 无卖单")
                     return
@@ -8927,8 +8941,8 @@ class OpinionSDKTrader:
             if price is None:
                 # 获取买1价
                 ob = OrderbookService.fetch(client, token_id)
-                if ob['success'] and ob['bid1_price'] > 0:
-                    price = ob['bid1_price']
+                if ob.success and ob.bid1_price > 0:
+                    price = ob.bid1_price
                 else:
                     error(f"[{config.remark}] 卖出#{op_num}: 无买单")
                     return
@@ -8965,11 +8979,11 @@ class OpinionSDKTrader:
         try:
             # 获取盘口
             ob = OrderbookService.fetch(client, token_id)
-            if not ob['success'] or ob['ask1_price'] <= 0:
+            if not ob.success or ob.ask1_price <= 0:
                 error(f"[{config.remark}] 买入#{op_num}: 无卖单")
                 return
 
-            price = ob['ask1_price']
+            price = ob.ask1_price
             price_str = f"{price:.6f}"
             price_display = self.format_price(price) + '¢'
 
@@ -9007,11 +9021,11 @@ class OpinionSDKTrader:
 
             # 获取盘口
             ob = OrderbookService.fetch(client, token_id)
-            if not ob['success'] or ob['bid1_price'] <= 0:
+            if not ob.success or ob.bid1_price <= 0:
                 error(f"[{config.remark}] 卖出#{op_num}: 无买单")
                 return
 
-            price = ob['bid1_price']
+            price = ob.bid1_price
             price_str = f"{price:.6f}"
             price_display = self.format_price(price) + '¢'
 
@@ -9060,9 +9074,9 @@ class OpinionSDKTrader:
             # 获取盘口
             ob = OrderbookService.fetch(client, token_id)
 
-            if ob['success']:
-                if ob['bid1_price'] > 0:
-                    price = ob['bid1_price']
+            if ob.success:
+                if ob.bid1_price > 0:
+                    price = ob.bid1_price
                     price_str = f"{price:.6f}"
                     price_display = self.format_price(price) + '¢'
 
@@ -9247,12 +9261,12 @@ class OpinionSDKTrader:
             # 获取订单簿（使用第一个账户）
             client = self.clients[selected_indices[0] - 1]
             ob = OrderbookService.fetch(client, token_id)
-            if not ob['success']:
+            if not ob.success:
                 error(f"获取订单簿失败，无法卖出")
                 return
 
-            bid1_price = ob['bid1_price']
-            ask1_price = ob['ask1_price']
+            bid1_price = ob.bid1_price
+            ask1_price = ob.ask1_price
 
             # 使用交互助手获取卖出选项
             action, sell_price = OrderInputHelper.prompt_sell_after_split(
@@ -10763,20 +10777,20 @@ class OpinionSDKTrader:
                 format_price_func=format_price
             )
 
-            if ob['success'] and ob['bids'] and ob['asks']:
-                bid_depth = ob['bid_depth']
-                ask_depth = ob['ask_depth']
+            if ob.success and ob.bids and ob.asks:
+                bid_depth = ob.bid_depth
+                ask_depth = ob.ask_depth
 
                 # 构建 bid_details 和 ask_details 用于后续价格选择
                 bid_details = []
                 bid_cumulative = 0
-                for i, (price, size) in enumerate(ob['bids'][:5]):
+                for i, (price, size) in enumerate(ob.bids[:5]):
                     bid_cumulative += price * size
                     bid_details.append((i + 1, price, size, bid_cumulative))
 
                 ask_details = []
                 ask_cumulative = 0
-                for i, (price, size) in enumerate(ob['asks'][:5]):
+                for i, (price, size) in enumerate(ob.asks[:5]):
                     ask_cumulative += price * size
                     ask_details.append((i + 1, price, size, ask_cumulative))
 
@@ -10813,7 +10827,7 @@ class OpinionSDKTrader:
                     else:
                         success(f"盘口深度充足")
             else:
-                error_msg = ob.get('error', '盘口数据为空')
+                error_msg = ob.error or '盘口数据为空'
                 warning(f" 警告: {error_msg}")
                 continue_choice = ask("\n无法获取盘口信息,是否继续? (y/n): ").lower()
                 if continue_choice != 'y':
@@ -11217,7 +11231,7 @@ class OpinionSDKTrader:
                             # 获取最新盘口
                             ob = OrderbookService.fetch(client, token_id)
 
-                            if ob['success']:
+                            if ob.success:
                                 if buy_order_type == LIMIT_ORDER:
                                     side = 'ask' if buy_use_ask else 'bid'
                                     price = OrderbookService.get_price_at_level(
@@ -11250,7 +11264,7 @@ class OpinionSDKTrader:
                                     print(
                                         f"  ✗ 买入#{i}失败: {self.translate_error(result.errmsg)}")
                             else:
-                                error(f"获取盘口失败: {ob.get('error', '未知错误')}")
+                                error(f"获取盘口失败: {ob.error or '未知错误'}")
 
                             # 随机延迟
                             delay = random.uniform(3, 10)
@@ -11546,7 +11560,7 @@ class OpinionSDKTrader:
                         # 获取最新盘口
                         ob = OrderbookService.fetch(client, token_id)
 
-                        if ob['success']:
+                        if ob.success:
                             if sell_order_type == LIMIT_ORDER:
                                 side = 'ask' if sell_use_ask else 'bid'
                                 price = OrderbookService.get_price_at_level(
@@ -11614,7 +11628,7 @@ class OpinionSDKTrader:
                                     print(
                                         f"  ✗ 卖出#{i}失败: {self.translate_error(result.errmsg)}")
                         else:
-                            error(f"获取盘口失败: {ob.get('error', '未知错误')}")
+                            error(f"获取盘口失败: {ob.error or '未知错误'}")
 
                         # 随机延迟
                         delay = random.uniform(3, 10)
@@ -11642,7 +11656,7 @@ class OpinionSDKTrader:
                     try:
                         ob = OrderbookService.fetch(client, token_id)
 
-                        if ob['success']:
+                        if ob.success:
                             if buy_order_type == LIMIT_ORDER:
                                 side = 'ask' if buy_use_ask else 'bid'
                                 price = OrderbookService.get_price_at_level(
@@ -11672,7 +11686,7 @@ class OpinionSDKTrader:
                                 print(
                                     f"  ✗ 买入#{i}失败: {self.translate_error(result.errmsg)}")
                         else:
-                            error(f"获取盘口失败: {ob.get('error', '未知错误')}")
+                            error(f"获取盘口失败: {ob.error or '未知错误'}")
 
                         delay = random.uniform(3, 10)
                         time.sleep(delay)
@@ -11807,7 +11821,7 @@ class OpinionSDKTrader:
             )
 
         try:
-            asyncio.run(run_monitor())
+            run_async(run_monitor())
         except KeyboardInterrupt:
             success("监控已停止")
 
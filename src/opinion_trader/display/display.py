@@ -5,6 +5,7 @@ Opinion SDK 显示模块
 import sys
 import time
 import threading
+from typing import Sequence
 
 
 class ProgressBar:
@@ -506,7 +507,7 @@ class OrderbookDisplay:
             return f"{price:.4f}"
 
     @staticmethod
-    def show(bids: list, asks: list, mode: str = "simple",
+    def show(bids: Sequence, asks: Sequence, mode: str = "simple",
              max_rows: int = 5, title: str = "盘口信息",
              show_summary: bool = True, format_price_func=None) -> tuple:
         """
@@ -4,7 +4,7 @@
 包含订单簿、订单、持仓、市场信息等服务
 """
 
-from opinion_trader.services.orderbook import OrderbookService
+from opinion_trader.services.orderbook import OrderbookService, OrderbookSnapshot
 from opinion_trader.services.order import OrderBuilder
 from opinion_trader.services.position import PositionService
 from opinion_trader.services.market import MarketInfoService, MarketListService
@@ -17,6 +17,7 @@ from opinion_trader.services.orderbook_manager import (
 
 __all__ = [
     "OrderbookService",
+    "OrderbookSnapshot",
     "OrderBuilder",
     "PositionService",
     "MarketInfoService",
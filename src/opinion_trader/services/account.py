@@ -1,7 +1,8 @@
 """
 账户迭代器模块 - 统一处理多账户操作
 """
-from typing import List, Callable, Any, Tuple, Set
+import time
+from typing import List, Callable, Any, Tuple, Set, Optional
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from opinion_trader.display.progress import ProgressBar
@@ -10,6 +11,9 @@ from opinion_trader.display.progress import ProgressBar
 class AccountIterator:
     """账户迭代器 - 统一处理多账户操作"""
 
+    # 进度条最小刷新间隔（秒），避免账户多时频繁写终端
+    PROGRESS_INTERVAL = 0.05
+
     def __init__(self, configs: list, clients: list):
         """
         Args:
@@ -18,6 +22,37 @@ class AccountIterator:
         """
         self.configs = configs
         self.clients = clients
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._max_workers = 0
+
+    def _get_pool(self, max_workers: int) -> ThreadPoolExecutor:
+        """获取共享线程池 (懒创建，并发上限提高时重建)"""
+        if self._pool is None or max_workers > self._max_workers:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False)
+            self._max_workers = max(max_workers, self._max_workers)
+            self._pool = ThreadPoolExecutor(max_workers=self._max_workers)
+        return self._pool
+
+    def close(self):
+        """关闭共享线程池"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    def _resolve(self, selected_indices: List[int]) -> List[Tuple[int, Any, Any]]:
+        """将 1-based 账户索引转换为 [(acc_idx, config, client), ...]，跳过越界索引"""
+        count = len(self.configs)
+        configs = self.configs
+        clients = self.clients
+        return [(acc_idx, configs[acc_idx - 1], clients[acc_idx - 1])
+                for acc_idx in selected_indices if 1 <= acc_idx <= count]
 
     def iterate(
         self,
@@ -38,19 +73,19 @@ class AccountIterator:
             {acc_idx: result, ...}
         """
         results = {}
-        total = len(selected_indices)
         errors = []
+        pairs = self._resolve(selected_indices)
+        total = len(pairs)
 
-        for i, acc_idx in enumerate(selected_indices):
-            if acc_idx < 1 or acc_idx > len(self.configs):
-                continue
-
-            config = self.configs[acc_idx - 1]
-            client = self.clients[acc_idx - 1]
+        last_render = 0.0
 
+        for i, (acc_idx, config, client) in enumerate(pairs):
             if show_progress:
-                ProgressBar.show_progress(
-                    i, total, prefix=progress_prefix, suffix=config.remark)
+                now = time.monotonic()
+                if i == total - 1 or now - last_render >= self.PROGRESS_INTERVAL:
+                    ProgressBar.show_progress(
+                        i, total, prefix=progress_prefix, suffix=config.remark)
+                    last_render = now
 
             try:
                 results[acc_idx] = callback(acc_idx, client, config)
@@ -97,29 +132,32 @@ class AccountIterator:
             {acc_idx: result, ...}
         """
         results = {}
-        total = len(selected_indices)
+        pairs = self._resolve(selected_indices)
+        total = len(pairs)
         completed = 0
+        last_render = 0.0
 
-        def worker(acc_idx):
-            config = self.configs[acc_idx - 1]
-            client = self.clients[acc_idx - 1]
+        def worker(acc_idx, config, client):
             return acc_idx, callback(acc_idx, client, config)
 
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = {executor.submit(worker, idx): idx for idx in selected_indices
-                       if 1 <= idx <= len(self.configs)}
+        executor = self._get_pool(max_workers)
+        futures = {executor.submit(worker, acc_idx, config, client): acc_idx
+                   for acc_idx, config, client in pairs}
 
-            for future in as_completed(futures):
-                try:
-                    acc_idx, result = future.result()
-                    results[acc_idx] = result
-                except Exception as e:
-                    acc_idx = futures[future]
-                    results[acc_idx] = {'error': str(e)}
+        for future in as_completed(futures):
+            try:
+                acc_idx, result = future.result()
+                results[acc_idx] = result
+            except Exception as e:
+                acc_idx = futures[future]
+                results[acc_idx] = {'error': str(e)}
 
-                completed += 1
-                if show_progress:
+            completed += 1
+            if show_progress:
+                now = time.monotonic()
+                if completed == total or now - last_render >= self.PROGRESS_INTERVAL:
                     ProgressBar.show_progress(completed, total, prefix='并行处理')
+                    last_render = now
 
         return results
 
@@ -1,19 +1,68 @@
 """
 市场信息服务模块 - 获取市场详情和列表
 """
+import sys
 import time
 import threading
 from datetime import datetime
-from typing import Optional, Callable, List
+from operator import itemgetter
+from types import MappingProxyType
+from typing import Optional, Callable, Dict, List, Tuple, NamedTuple, Mapping
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from opinion_trader.services.orderbook import OrderbookService
 
+# 无到期时间的市场排序键 (整数比较，排在所有时间戳之后)
+_NO_END_SORT_KEY = 2 ** 63
+
+
+class MarketSnapshot(NamedTuple):
+    """市场列表快照 - 发布后不再修改，读取方无需加锁"""
+    markets: tuple = ()     # 按到期时间排序的市场列表
+    by_id: Mapping = MappingProxyType({})  # {market_id: market} 索引 (只读)
+    cache_time: float = 0   # 缓存时间
+
 
 class MarketInfoService:
     """市场信息服务 - 统一获取市场详情"""
 
+    # 市场类型缓存 {market_id: 'categorical'/'binary'}
+    _market_type_cache: Dict[int, str] = {}
+
+    @staticmethod
+    def _extract_token_ids(data) -> Tuple[Optional[str], Optional[str], list]:
+        """从二元市场数据中提取 Yes/No Token ID (兼容多种SDK返回格式)
+
+        Returns:
+            (yes_token_id, no_token_id, tokens)
+        """
+        yes_token_id = None
+        no_token_id = None
+        tokens = []
+
+        yes_token = getattr(data, 'yes_token', None)
+        if yes_token:
+            no_token = getattr(data, 'no_token', None)
+            yes_token_id = str(yes_token.token_id)
+            no_token_id = str(no_token.token_id) if no_token else None
+        elif getattr(data, 'yes_token_id', None):
+            yes_token_id = str(data.yes_token_id)
+            no_token_id = str(data.no_token_id) if hasattr(
+                data, 'no_token_id') else None
+        elif getattr(data, 'tokens', None):
+            tokens = data.tokens
+            for token in tokens:
+                ticker = getattr(token, 'ticker', None) or ''
+                ticker = ticker.upper()
+                if 'YES' in ticker:
+                    yes_token_id = str(token.token_id)
+                elif 'NO' in ticker:
+                    no_token_id = str(token.token_id)
+
+        return yes_token_id, no_token_id, tokens
+
     @staticmethod
     def get_market_info(client, market_id: int) -> dict:
         """获取市场信息 (自动判断分类/二元市场)
@@ -35,11 +84,38 @@ class MarketInfoService:
                 'error': str (如果失败)
             }
         """
+        # 已知类型的市场先请求对应接口，二元市场无需先走一次分类接口
+        probes = [('categorical', MarketInfoService._probe_categorical),
+                  ('binary', MarketInfoService._probe_binary)]
+        if MarketInfoService._guess_market_type(market_id) == 'binary':
+            probes.reverse()
+
         # 记录API错误信息，用于最终提示
-        cat_error = None
-        bin_error = None
+        errors = {}
+        for market_type, probe in probes:
+            result, errors[market_type] = probe(client, market_id)
+            if result:
+                MarketInfoService._market_type_cache[market_id] = market_type
+                return result
 
-        # 先尝试作为分类市场获取
+        # 两种方式都失败，返回详细错误
+        error_msg = errors.get('binary') or errors.get('categorical') or '未知错误'
+        return {'success': False, 'error': f'市场不存在或已下架，请检查市场ID ({error_msg})'}
+
+    @staticmethod
+    def _guess_market_type(market_id: int) -> Optional[str]:
+        """根据历史查询结果或市场列表缓存推断市场类型 ('categorical'/'binary')"""
+        market_type = MarketInfoService._market_type_cache.get(market_id)
+        if market_type:
+            return market_type
+        listed = MarketListService.get_market_by_id(market_id)
+        if listed:
+            return 'categorical' if listed['is_categorical'] else 'binary'
+        return None
+
+    @staticmethod
+    def _probe_categorical(client, market_id: int) -> tuple:
+        """按分类市场获取，返回 (result, error)"""
         try:
             cat_resp = client.get_categorical_market(market_id=market_id)
             if cat_resp.errno == 0 and cat_resp.result and cat_resp.result.data:
@@ -57,39 +133,22 @@ class MarketInfoService:
                     'no_token_id': None,
                     'tokens': [],
                     'raw': data
-                }
+                }, None
             else:
-                cat_error = cat_resp.errmsg if hasattr(
+                return None, cat_resp.errmsg if hasattr(
                     cat_resp, 'errmsg') and cat_resp.errmsg else f'errno={cat_resp.errno}'
         except Exception as e:
-            cat_error = str(e)
+            return None, str(e)
 
-        # 尝试作为二元市场获取
+    @staticmethod
+    def _probe_binary(client, market_id: int) -> tuple:
+        """按二元市场获取，返回 (result, error)"""
         try:
             bin_resp = client.get_market(market_id=market_id)
             if bin_resp.errno == 0 and bin_resp.result and bin_resp.result.data:
                 data = bin_resp.result.data
-                yes_token_id = None
-                no_token_id = None
-                tokens = []
-
-                # 尝试多种方式获取token
-                if hasattr(data, 'yes_token') and data.yes_token:
-                    yes_token_id = str(data.yes_token.token_id)
-                    no_token_id = str(
-                        data.no_token.token_id) if data.no_token else None
-                elif hasattr(data, 'yes_token_id') and data.yes_token_id:
-                    yes_token_id = str(data.yes_token_id)
-                    no_token_id = str(data.no_token_id) if hasattr(
-                        data, 'no_token_id') else None
-                elif hasattr(data, 'tokens') and data.tokens:
-                    tokens = data.tokens
-                    for token in tokens:
-                        ticker = token.ticker.upper() if hasattr(token, 'ticker') else ''
-                        if 'YES' in ticker:
-                            yes_token_id = str(token.token_id)
-                        elif 'NO' in ticker:
-                            no_token_id = str(token.token_id)
+                yes_token_id, no_token_id, tokens = MarketInfoService._extract_token_ids(
+                    data)
 
                 return {
                     'success': True,
@@ -100,16 +159,12 @@ class MarketInfoService:
                     'no_token_id': no_token_id,
                     'tokens': tokens,
                     'raw': data
-                }
+                }, None
             else:
-                bin_error = bin_resp.errmsg if hasattr(
+                return None, bin_resp.errmsg if hasattr(
                     bin_resp, 'errmsg') and bin_resp.errmsg else f'errno={bin_resp.errno}'
         except Exception as e:
-            bin_error = str(e)
-
-        # 两种方式都失败，返回详细错误
-        error_msg = bin_error or cat_error or '未知错误'
-        return {'success': False, 'error': f'市场不存在或已下架，请检查市场ID ({error_msg})'}
+            return None, str(e)
 
     @staticmethod
     def get_child_market_info(client, child_market_id: int) -> dict:
@@ -130,24 +185,8 @@ class MarketInfoService:
                 return {'success': False, 'error': '获取子市场失败'}
 
             data = resp.result.data
-            yes_token_id = None
-            no_token_id = None
-
-            if hasattr(data, 'yes_token') and data.yes_token:
-                yes_token_id = str(data.yes_token.token_id)
-                no_token_id = str(
-                    data.no_token.token_id) if data.no_token else None
-            elif hasattr(data, 'yes_token_id'):
-                yes_token_id = str(data.yes_token_id)
-                no_token_id = str(data.no_token_id) if hasattr(
-                    data, 'no_token_id') else None
-            elif hasattr(data, 'tokens') and data.tokens:
-                for token in data.tokens:
-                    ticker = token.ticker.upper() if hasattr(token, 'ticker') else ''
-                    if 'YES' in ticker:
-                        yes_token_id = str(token.token_id)
-                    elif 'NO' in ticker:
-                        no_token_id = str(token.token_id)
+            yes_token_id, no_token_id, _ = MarketInfoService._extract_token_ids(
+                data)
 
             return {
                 'success': True,
@@ -214,8 +253,8 @@ class MarketInfoService:
                 try:
                     ob_yes = OrderbookService.fetch(
                         client, child_info['yes_token_id'])
-                    if ob_yes['success']:
-                        child_data['yes_price'] = ob_yes['bid1_price']
+                    if ob_yes.success:
+                        child_data['yes_price'] = ob_yes.bid1_price
                 except Exception:
                     pass
 
@@ -223,8 +262,8 @@ class MarketInfoService:
                     if child_info['no_token_id']:
                         ob_no = OrderbookService.fetch(
                             client, child_info['no_token_id'])
-                        if ob_no['success']:
-                            child_data['no_price'] = ob_no['bid1_price']
+                        if ob_no.success:
+                            child_data['no_price'] = ob_no.bid1_price
                 except Exception:
                     pass
 
@@ -244,14 +283,13 @@ class MarketListService:
     支持：
     - 程序启动时自动加载
     - 后台定期自动刷新
-    - 线程安全的读写操作
+    - 线程安全的读写操作 (写入时整体替换不可变快照，读取无锁)
     """
 
-    _markets_cache: List[dict] = []  # 市场列表缓存
-    _cache_time: float = 0  # 缓存时间
+    _snapshot: MarketSnapshot = MarketSnapshot()  # 市场列表快照 (只整体替换)
     _loading: bool = False  # 是否正在加载
     _loaded: bool = False  # 是否已加载完成
-    _lock = threading.Lock()  # 读写锁
+    _load_lock = threading.Lock()  # 加载锁 (非阻塞获取，同一时间只有一个加载；读取无需加锁)
 
     # 后台刷新相关
     _client = None  # SDK客户端引用
@@ -259,10 +297,19 @@ class MarketListService:
     _refresh_interval: int = 60  # 刷新间隔（秒）
     _refresh_thread = None  # 刷新线程
     _stop_event = threading.Event()  # 停止事件
+    _refresh_event = threading.Event()  # 唤醒刷新线程事件
+    _initial_load_done = threading.Event()  # 首次加载结束事件 (无论成功与否)
 
     # Opinion.trade 市场链接前缀
     MARKET_URL_PREFIX = "https://opinion.trade/market/"
 
+    # HTTP API 回退地址 (复用连接，避免每次刷新重新握手)
+    HTTP_API_BASE = "https://proxy.opinion.trade:8443"
+    _http_session = None
+
+    # 完整列表渲染缓存 {(cache_time, max_count): 文本}，发布新快照时清空
+    _display_cache: dict = {}
+
     @classmethod
     def initialize(cls, client, auto_refresh: bool = True, refresh_interval: int = 60):
         """初始化市场列表服务（程序启动时调用）
@@ -272,12 +319,12 @@ class MarketListService:
             auto_refresh: 是否启用自动刷新
             refresh_interval: 刷新间隔（秒），默认60秒
         """
-        with cls._lock:
-            cls._client = client
-            cls._refresh_interval = refresh_interval
+        cls._client = client
+        cls._refresh_interval = refresh_interval
 
-        # 立即执行首次加载
-        cls._fetch_and_update()
+        # 首次加载放到后台线程，不阻塞程序启动
+        threading.Thread(target=cls._fetch_and_update, daemon=True,
+                         name="MarketListInitialLoad").start()
 
         # 启动自动刷新
         if auto_refresh:
@@ -290,13 +337,17 @@ class MarketListService:
             return
 
         cls._auto_refresh_enabled = True
-        cls._stop_event.clear()
+        # 每个刷新线程使用新的事件对象：上一次 stop 留下的唤醒信号不会让新线程立即刷新，
+        # join 超时仍在运行的旧线程也只看自己的停止事件
+        stop_event = cls._stop_event = threading.Event()
+        refresh_event = cls._refresh_event = threading.Event()
 
         def refresh_loop():
-            while not cls._stop_event.is_set():
-                # 等待刷新间隔
-                cls._stop_event.wait(cls._refresh_interval)
-                if cls._stop_event.is_set():
+            while not stop_event.is_set():
+                # 等待刷新间隔，refresh_now() / stop_auto_refresh() 可提前唤醒
+                refresh_event.wait(cls._refresh_interval)
+                refresh_event.clear()
+                if stop_event.is_set():
                     break
                 # 执行刷新
                 cls._fetch_and_update()
@@ -310,6 +361,7 @@ class MarketListService:
         """停止后台自动刷新"""
         cls._auto_refresh_enabled = False
         cls._stop_event.set()
+        cls._refresh_event.set()
         if cls._refresh_thread and cls._refresh_thread.is_alive():
             cls._refresh_thread.join(timeout=2)
         cls._refresh_thread = None
@@ -317,25 +369,35 @@ class MarketListService:
     @classmethod
     def _fetch_and_update(cls):
         """获取并更新市场数据（内部方法）"""
-        if cls._loading or cls._client is None:
+        if cls._client is None:
             return
 
-        with cls._lock:
-            if cls._loading:
-                return
-            cls._loading = True
+        # 已有加载在进行时直接返回，不排队等待
+        if not cls._load_lock.acquire(blocking=False):
+            return
+        cls._loading = True
 
         try:
             markets = cls._fetch_all_markets(cls._client)
-            with cls._lock:
-                cls._markets_cache = markets
-                cls._cache_time = time.time()
-                cls._loaded = True
+            cls._publish(markets)
         except Exception:
             pass  # 静默失败，保留旧缓存
         finally:
-            with cls._lock:
-                cls._loading = False
+            cls._loading = False
+            cls._load_lock.release()
+            cls._initial_load_done.set()
+
+    @classmethod
+    def _publish(cls, markets: list):
+        """发布新的市场列表快照 (整体替换引用，读取方拿到的旧快照不受影响)
+
+        单个市场以只读视图发布，读取方可直接返回引用而无需复制。
+        """
+        frozen = tuple(MappingProxyType(m) for m in markets)
+        by_id = MappingProxyType({m['market_id']: m for m in frozen})
+        cls._snapshot = MarketSnapshot(frozen, by_id, time.time())
+        cls._display_cache = {}
+        cls._loaded = True
 
     @classmethod
     def start_background_fetch(cls, client, callback: Optional[Callable[[List[dict]], None]] = None):
@@ -348,36 +410,42 @@ class MarketListService:
         # 如果已经初始化过，直接返回
         if cls._client is not None and cls._loaded:
             if callback:
-                callback(cls._markets_cache)
+                callback(list(cls._snapshot.markets))
             return
 
         # 使用新的初始化方法
         cls._client = client
 
-        if cls._loading:
+        if not cls._load_lock.acquire(blocking=False):
             return
-
-        with cls._lock:
-            cls._loading = True
+        cls._loading = True
 
         def fetch_markets():
             try:
                 markets = cls._fetch_all_markets(client)
-                with cls._lock:
-                    cls._markets_cache = markets
-                    cls._cache_time = time.time()
-                    cls._loaded = True
+                cls._publish(markets)
                 if callback:
                     callback(markets)
             except Exception:
                 pass  # 静默失败
             finally:
-                with cls._lock:
-                    cls._loading = False
+                cls._loading = False
+                cls._load_lock.release()
+                cls._initial_load_done.set()
 
         thread = threading.Thread(target=fetch_markets, daemon=True)
         thread.start()
 
+    @classmethod
+    def _get_http_session(cls):
+        """获取复用连接的 HTTP 会话（懒创建）"""
+        if cls._http_session is None:
+            session = requests.Session()
+            session.mount(cls.HTTP_API_BASE, HTTPAdapter(
+                pool_connections=2, pool_maxsize=4))
+            cls._http_session = session
+        return cls._http_session
+
     @classmethod
     def _fetch_all_markets(cls, client, limit: int = 50) -> List[dict]:
         """获取所有活跃市场并按到期时间排序
@@ -412,7 +480,11 @@ class MarketListService:
                     markets.append({
                         'market_id': market_id,
                         'title': title,
+                        'title_lower': title.lower(),  # 搜索用
+                        'title_short': title[:50] + '...' if len(title) > 50 else title,  # 列表显示用
+                        'market_id_str': str(market_id),
                         'end_time': end_time,
+                        'sort_key': cutoff_at or _NO_END_SORT_KEY,  # 排序用，无到期时间排最后
                         'end_time_str': end_time.strftime('%m-%d %H:%M') if end_time else '-',
                         'is_categorical': is_cat,
                         'volume': volume,
@@ -422,23 +494,23 @@ class MarketListService:
 
                 if markets:
                     # 按到期时间排序（最近到期的在前，None 排最后）
-                    markets.sort(
-                        key=lambda x: x['end_time'] if x['end_time'] else datetime.max)
+                    markets.sort(key=itemgetter('sort_key'))
                     return markets
         except Exception:
             pass  # SDK 方法失败，尝试 HTTP API
 
         # 方法2: 回退到 HTTP API (兼容旧版本)
         try:
+            session = cls._get_http_session()
             urls_to_try = [
-                "https://proxy.opinion.trade:8443/api/bsc/api/v2/markets",
-                "https://proxy.opinion.trade:8443/api/bsc/api/v2/market/list",
+                f"{cls.HTTP_API_BASE}/api/bsc/api/v2/markets",
+                f"{cls.HTTP_API_BASE}/api/bsc/api/v2/market/list",
             ]
 
             for url in urls_to_try:
                 try:
                     params = {'chainId': 56, 'limit': limit}
-                    response = requests.get(url, params=params, timeout=15)
+                    response = session.get(url, params=params, timeout=15)
 
                     if response.status_code == 200:
                         data = response.json()
@@ -450,28 +522,34 @@ class MarketListService:
                                 market_list = result
 
                             for m in market_list:
+                                market_id = m.get(
+                                    'marketId') or m.get('market_id')
+                                if not market_id:
+                                    continue
                                 end_time_ms = m.get(
                                     'endTime', 0) or m.get('end_time', 0)
+                                end_ts = end_time_ms / 1000 if end_time_ms else 0
                                 end_time = datetime.fromtimestamp(
-                                    end_time_ms / 1000) if end_time_ms else None
-                                market_id = m.get(
-                                    'marketId') or m.get('market_id')
+                                    end_ts) if end_ts else None
                                 slug = m.get('slug', '') or m.get(
                                     'marketSlug', '')
                                 title = m.get('marketTitle', '') or m.get(
                                     'title', '') or m.get('market_title', '')
 
-                                if market_id:
-                                    markets.append({
-                                        'market_id': market_id,
-                                        'title': title,
-                                        'end_time': end_time,
-                                        'end_time_str': end_time.strftime('%m-%d %H:%M') if end_time else '-',
-                                        'is_categorical': m.get('isCategorical', False) or m.get('is_categorical', False),
-                                        'volume': float(m.get('volume', 0) or 0),
-                                        'slug': slug,
-                                        'url': f"{cls.MARKET_URL_PREFIX}{slug}" if slug else f"{cls.MARKET_URL_PREFIX}{market_id}",
-                                    })
+                                markets.append({
+                                    'market_id': market_id,
+                                    'title': title,
+                                    'title_lower': title.lower(),  # 搜索用
+                                    'title_short': title[:50] + '...' if len(title) > 50 else title,  # 列表显示用
+                                    'market_id_str': str(market_id),
+                                    'end_time': end_time,
+                                    'sort_key': end_ts or _NO_END_SORT_KEY,  # 排序用，无到期时间排最后
+                                    'end_time_str': end_time.strftime('%m-%d %H:%M') if end_time else '-',
+                                    'is_categorical': m.get('isCategorical', False) or m.get('is_categorical', False),
+                                    'volume': float(m.get('volume', 0) or 0),
+                                    'slug': slug,
+                                    'url': f"{cls.MARKET_URL_PREFIX}{slug}" if slug else f"{cls.MARKET_URL_PREFIX}{market_id}",
+                                })
                             if markets:
                                 break
                 except Exception:
@@ -480,49 +558,65 @@ class MarketListService:
             pass
 
         # 按到期时间排序
-        markets.sort(key=lambda x: x['end_time']
-                     if x['end_time'] else datetime.max)
+        markets.sort(key=itemgetter('sort_key'))
         return markets
 
     @classmethod
-    def get_cached_markets(cls) -> List[dict]:
+    def get_cached_markets(cls) -> Tuple[Mapping, ...]:
         """获取缓存的市场列表（线程安全）"""
-        with cls._lock:
-            return cls._markets_cache.copy()  # 返回副本避免外部修改
+        return cls._snapshot.markets  # 不可变快照，直接返回；需要修改时调用方自行 list()
 
     @classmethod
-    def get_market_by_id(cls, market_id: int) -> Optional[dict]:
+    def get_market_by_id(cls, market_id: int) -> Optional[Mapping]:
         """根据ID获取单个市场信息（线程安全）
 
         Args:
             market_id: 市场ID
 
         Returns:
-            市场信息字典，未找到返回 None
+            市场信息 (只读)，未找到返回 None
         """
-        with cls._lock:
-            for m in cls._markets_cache:
-                if m['market_id'] == market_id:
-                    return m.copy()
-        return None
+        return cls._snapshot.by_id.get(market_id)
 
     @classmethod
     def get_cache_age(cls) -> float:
         """获取缓存年龄（秒）"""
-        if cls._cache_time == 0:
+        cache_time = cls._snapshot.cache_time
+        if cache_time == 0:
             return float('inf')
-        return time.time() - cls._cache_time
+        return time.time() - cache_time
 
     @classmethod
-    def refresh_now(cls):
-        """立即刷新市场数据（同步）"""
-        cls._fetch_and_update()
+    def refresh_now(cls, wait: bool = False):
+        """立即刷新市场数据
+
+        后台刷新线程运行时默认只唤醒该线程并立即返回，此时数据还未更新；
+        需要拿到最新数据的调用方传 wait=True，在当前线程同步刷新。
+        没有后台线程时总是同步刷新。
+        """
+        if not wait and cls._refresh_thread and cls._refresh_thread.is_alive():
+            cls._refresh_event.set()
+        else:
+            cls._fetch_and_update()
 
     @classmethod
     def is_loaded(cls) -> bool:
         """是否已加载完成"""
         return cls._loaded
 
+    @classmethod
+    def wait_until_loaded(cls, timeout: Optional[float] = None) -> bool:
+        """等待首次加载结束
+
+        Args:
+            timeout: 最长等待秒数，None 表示一直等待
+
+        Returns:
+            是否已加载完成
+        """
+        cls._initial_load_done.wait(timeout)
+        return cls._loaded
+
     @classmethod
     def is_loading(cls) -> bool:
         """是否正在加载"""
@@ -535,10 +629,9 @@ class MarketListService:
         Args:
             max_count: 最多显示数量
         """
-        with cls._lock:
-            loaded = cls._loaded
-            loading = cls._loading
-            markets = cls._markets_cache[:max_count] if loaded else []
+        loaded = cls._loaded
+        loading = cls._loading
+        markets = cls._snapshot.markets[:max_count] if loaded else ()
 
         if not loaded:
             if loading:
@@ -559,10 +652,8 @@ class MarketListService:
         for m in markets:
             market_id = m['market_id']
             end_time = m['end_time_str']
-            title = m['title'][:50] + \
-                '...' if len(m['title']) > 50 else m['title']
             cat_mark = ' [分类]' if m['is_categorical'] else ''
-            print(f"  {market_id:<8} {end_time:<14} {title}{cat_mark}")
+            print(f"  {market_id:<8} {end_time:<14} {m['title_short']}{cat_mark}")
             print(f"           └─ {m['url']}")
 
         print(f"{'─'*80}")
@@ -574,11 +665,11 @@ class MarketListService:
         Args:
             max_count: 最多显示数量
         """
-        with cls._lock:
-            loaded = cls._loaded
-            loading = cls._loading
-            markets = cls._markets_cache[:max_count] if loaded else []
-            total_count = len(cls._markets_cache)
+        snapshot = cls._snapshot
+        loaded = cls._loaded
+        loading = cls._loading
+        markets = snapshot.markets[:max_count] if loaded else ()
+        total_count = len(snapshot.markets)
 
         if not loaded:
             if loading:
@@ -591,39 +682,43 @@ class MarketListService:
             print("\n暂无市场数据")
             return
 
-        print(f"\n{'='*80}")
-        print(f"{'活跃市场列表':^80}")
-        print(f"{'='*80}")
+        # 同一快照、同一数量的渲染结果直接复用 (快照刷新后 cache_time 变化自动失效)
+        key = (snapshot.cache_time, max_count)
+        text = cls._display_cache.get(key)
+        if text is None:
+            lines = [
+                f"\n{'='*80}",
+                f"{'活跃市场列表':^80}",
+                f"{'='*80}",
+            ]
+
+            for i, m in enumerate(markets, 1):
+                cat_mark = '[分类市场]' if m['is_categorical'] else '[二元市场]'
+                lines.append(f"\n{i}. {m['title']}")
+                lines.append(
+                    f"   ID: {m['market_id']}  |  到期: {m['end_time_str']}  |  交易量: ${m['volume']:,.0f}  |  {cat_mark}")
+                lines.append(f"   链接: {m['url']}")
 
-        for i, m in enumerate(markets, 1):
-            market_id = m['market_id']
-            end_time = m['end_time_str']
-            title = m['title']
-            url = m['url']
-            volume = m['volume']
-            cat_mark = '[分类市场]' if m['is_categorical'] else '[二元市场]'
+            lines.append(f"\n{'='*80}")
+            if total_count > max_count:
+                lines.append(f"(共 {total_count} 个市场，仅显示前 {max_count} 个)")
 
-            print(f"\n{i}. {title}")
-            print(
-                f"   ID: {market_id}  |  到期: {end_time}  |  交易量: ${volume:,.0f}  |  {cat_mark}")
-            print(f"   链接: {url}")
+            text = '\n'.join(lines) + '\n'
+            cls._display_cache[key] = text
 
-        print(f"\n{'='*80}")
-        if total_count > max_count:
-            print(f"(共 {total_count} 个市场，仅显示前 {max_count} 个)")
+        sys.stdout.write(text)
 
     @classmethod
-    def search_markets(cls, keyword: str) -> List[dict]:
+    def search_markets(cls, keyword: str) -> List[Mapping]:
         """搜索市场（线程安全）"""
         keyword = keyword.lower()
-        with cls._lock:
-            return [m.copy() for m in cls._markets_cache
-                    if keyword in m['title'].lower() or keyword in str(m['market_id'])]
+        return [m for m in cls._snapshot.markets
+                if keyword in m['title_lower'] or keyword in m['market_id_str']]
 
     @classmethod
     def get_market_url(cls, market_id: int) -> str:
         """获取市场链接"""
-        m = cls.get_market_by_id(market_id)
+        m = cls._snapshot.by_id.get(market_id)
         if m:
             return m['url']
         return f"{cls.MARKET_URL_PREFIX}{market_id}"
@@ -2,6 +2,7 @@
 订单构建器模块 - 统一创建和执行订单
 """
 import time
+import random
 from typing import Optional, Callable
 
 
@@ -145,9 +146,11 @@ class OrderBuilder:
         order,
         max_retries: int = 2,
         translate_error_func: Optional[Callable[[str], str]] = None,
-        remark: str = ''
+        remark: str = '',
+        initial_delay: float = 0.1,
+        max_delay: float = 2.0
     ) -> dict:
-        """带重试的订单执行
+        """带重试的订单执行 (指数退避 + 随机抖动，避免多账户同时重试)
 
         Args:
             client: SDK客户端
@@ -155,6 +158,8 @@ class OrderBuilder:
             max_retries: 最大重试次数
             translate_error_func: 错误翻译函数
             remark: 账户备注
+            initial_delay: 首次重试等待秒数
+            max_delay: 最大等待秒数
         """
         last_error = None
         for attempt in range(max_retries + 1):
@@ -164,5 +169,7 @@ class OrderBuilder:
                 return result
             last_error = result.get('error', '未知错误')
             if attempt < max_retries:
-                time.sleep(0.5)
+                delay = initial_delay * (2 ** attempt) + \
+                    random.uniform(0, initial_delay)
+                time.sleep(min(max_delay, delay))
         return {'success': False, 'error': last_error}
@@ -1,16 +1,51 @@
 """
 订单簿服务模块 - 统一获取和解析订单簿数据
 """
-from typing import Optional, Callable
+from itertools import starmap
+from operator import mul
+from typing import Optional, Callable, NamedTuple, Sequence, Tuple, Any
 
 from opinion_trader.display.orderbook import OrderbookDisplay
 
 
+class OrderbookSnapshot(NamedTuple):
+    """订单簿快照 - OrderbookService.fetch() 的返回值
+
+    推荐属性访问 (ob.bid1_price)，同时兼容旧的字典式访问 (ob['bid1_price'] / ob.get('error'))
+    """
+    success: bool
+    bids: Sequence[Tuple[float, float]] = ()  # [(price, size), ...] 按价格降序
+    asks: Sequence[Tuple[float, float]] = ()  # [(price, size), ...] 按价格升序
+    bid1_price: float = 0                     # 买1价
+    ask1_price: float = 0                     # 卖1价
+    bid1_size: float = 0                      # 买1量
+    ask1_size: float = 0                      # 卖1量
+    bid_depth: float = 0                      # 买盘深度(美元)
+    ask_depth: float = 0                      # 卖盘深度(美元)
+    spread: float = 0                         # 价差
+    mid_price: float = 0                      # 中间价
+    raw: Any = None                           # 原始orderbook对象
+    error: Optional[str] = None               # 错误信息 (如果失败)
+
+    def __getitem__(self, key) -> Any:
+        if isinstance(key, str):
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        return tuple.__getitem__(self, key)
+
+    def get(self, key: str, default=None):
+        """兼容 dict.get: 字段不存在或为 None 时返回默认值"""
+        value = getattr(self, key, None)
+        return default if value is None else value
+
+
 class OrderbookService:
     """订单簿服务模块 - 统一获取和解析订单簿数据"""
 
     @staticmethod
-    def fetch(client, token_id: str, max_depth: int = 5) -> dict:
+    def fetch(client, token_id: str, max_depth: int = 5) -> OrderbookSnapshot:
         """获取并解析订单簿
 
         Args:
@@ -19,26 +54,12 @@ class OrderbookService:
             max_depth: 计算深度的最大档位数
 
         Returns:
-            {
-                'success': bool,
-                'bids': [(price, size), ...],  # 按价格降序
-                'asks': [(price, size), ...],  # 按价格升序
-                'bid1_price': float,           # 买1价
-                'ask1_price': float,           # 卖1价
-                'bid1_size': float,            # 买1量
-                'ask1_size': float,            # 卖1量
-                'bid_depth': float,            # 买盘深度(美元)
-                'ask_depth': float,            # 卖盘深度(美元)
-                'spread': float,               # 价差
-                'mid_price': float,            # 中间价
-                'raw': orderbook对象,
-                'error': str (如果失败)
-            }
+            OrderbookSnapshot (字段说明见 OrderbookSnapshot)
         """
         try:
             response = client.get_orderbook(token_id=token_id)
             if response.errno != 0:
-                return {'success': False, 'error': response.errmsg if hasattr(response, 'errmsg') else '获取订单簿失败'}
+                return OrderbookSnapshot(success=False, error=response.errmsg if hasattr(response, 'errmsg') else '获取订单簿失败')
 
             orderbook = response.result
 
@@ -53,8 +74,8 @@ class OrderbookService:
             asks = [(float(a.price), float(a.size)) for a in asks_sorted]
 
             # 计算深度
-            bid_depth = sum(price * size for price, size in bids[:max_depth])
-            ask_depth = sum(price * size for price, size in asks[:max_depth])
+            bid_depth = sum(starmap(mul, bids[:max_depth]))
+            ask_depth = sum(starmap(mul, asks[:max_depth]))
 
             # 买1卖1
             bid1_price = bids[0][0] if bids else 0
@@ -67,22 +88,22 @@ class OrderbookService:
             mid_price = (bid1_price + ask1_price) / \
                 2 if bid1_price > 0 and ask1_price > 0 else 0
 
-            return {
-                'success': True,
-                'bids': bids,
-                'asks': asks,
-                'bid1_price': bid1_price,
-                'ask1_price': ask1_price,
-                'bid1_size': bid1_size,
-                'ask1_size': ask1_size,
-                'bid_depth': bid_depth,
-                'ask_depth': ask_depth,
-                'spread': spread,
-                'mid_price': mid_price,
-                'raw': orderbook
-            }
+            return OrderbookSnapshot(
+                success=True,
+                bids=bids,
+                asks=asks,
+                bid1_price=bid1_price,
+                ask1_price=ask1_price,
+                bid1_size=bid1_size,
+                ask1_size=ask1_size,
+                bid_depth=bid_depth,
+                ask_depth=ask_depth,
+                spread=spread,
+                mid_price=mid_price,
+                raw=orderbook
+            )
         except Exception as e:
-            return {'success': False, 'error': str(e)}
+            return OrderbookSnapshot(success=False, error=str(e))
 
     @staticmethod
     def fetch_and_display(
@@ -92,17 +113,17 @@ class OrderbookService:
         mode: str = "simple",
         max_rows: int = 5,
         format_price_func: Optional[Callable[[float], str]] = None
-    ) -> dict:
+    ) -> OrderbookSnapshot:
         """获取订单簿并显示
 
         Returns:
             同 fetch() 返回值
         """
         result = OrderbookService.fetch(client, token_id, max_depth=max_rows)
-        if result['success']:
+        if result.success:
             OrderbookDisplay.show(
-                bids=result['bids'],
-                asks=result['asks'],
+                bids=result.bids,
+                asks=result.asks,
                 mode=mode,
                 max_rows=max_rows,
                 title=title,
@@ -111,7 +132,7 @@ class OrderbookService:
         return result
 
     @staticmethod
-    def check_liquidity(orderbook_result: dict, required_amount: float, side: str = 'buy') -> dict:
+    def check_liquidity(orderbook_result: OrderbookSnapshot, required_amount: float, side: str = 'buy') -> dict:
         """检查流动性是否充足
 
         Args:
@@ -127,10 +148,10 @@ class OrderbookService:
                 'shortage': float
             }
         """
-        if not orderbook_result.get('success'):
+        if not orderbook_result.success:
             return {'sufficient': False, 'available': 0, 'required': required_amount, 'shortage': required_amount}
 
-        available = orderbook_result['ask_depth'] if side == 'buy' else orderbook_result['bid_depth']
+        available = orderbook_result.ask_depth if side == 'buy' else orderbook_result.bid_depth
         shortage = max(0, required_amount - available)
 
         return {
@@ -141,7 +162,7 @@ class OrderbookService:
         }
 
     @staticmethod
-    def get_price_at_level(orderbook_result: dict, side: str, level: int = 0, fallback: bool = True) -> float:
+    def get_price_at_level(orderbook_result: OrderbookSnapshot, side: str, level: int = 0, fallback: bool = True) -> float:
         """获取指定档位的价格
 
         Args:
@@ -153,15 +174,15 @@ class OrderbookService:
         Returns:
             价格，如果失败返回 0
         """
-        if not orderbook_result.get('success'):
+        if not orderbook_result.success:
             return 0
 
-        prices = orderbook_result['bids'] if side == 'bid' else orderbook_result['asks']
+        prices = orderbook_result.bids if side == 'bid' else orderbook_result.asks
         if not prices:
             return 0
 
         if len(prices) > level:
             return prices[level][0]
-        elif fallback and prices:
+        elif fallback:
             return prices[0][0]
         return 0
@@ -2,7 +2,7 @@
 持仓服务模块 - 统一获取和处理持仓
 """
 import time
-from typing import Optional, Tuple, List
+from typing import Optional, Tuple, List, Dict
 
 from opinion_trader.display.position import PositionDisplay
 
@@ -30,38 +30,70 @@ class PositionService:
             positions = response.result.list if hasattr(
                 response.result, 'list') else []
             result = []
+            target_token = str(token_id) if token_id else None
 
             for p in positions:
-                shares = int(
-                    float(p.shares_owned if hasattr(p, 'shares_owned') else 0))
-                if shares <= 0:
-                    continue
+                p_tok = getattr(p, 'token_id', None)
+                p_tok = str(p_tok) if p_tok is not None else None
 
-                # 过滤
-                if token_id and str(p.token_id) != str(token_id):
+                # 过滤 (先比较 token，避免无谓的数值解析)
+                if target_token and p_tok != target_token:
+                    continue
+                p_mkt = getattr(p, 'market_id', None)
+                if market_id and p_mkt is not None and p_mkt != market_id:
                     continue
-                if market_id and hasattr(p, 'market_id') and p.market_id != market_id:
+
+                shares = int(float(getattr(p, 'shares_owned', 0)))
+                if shares <= 0:
                     continue
 
                 parsed = PositionDisplay.parse_sdk_position(p)
                 if parsed:
-                    parsed['token_id'] = str(p.token_id) if hasattr(
-                        p, 'token_id') else None
+                    parsed['token_id'] = p_tok
                     result.append(parsed)
+                    # 同一 token 只会有一条持仓
+                    if target_token:
+                        break
 
             return result
         except Exception:
             return []
 
     @staticmethod
-    def get_token_balance(client, token_id: str) -> int:
-        """获取特定token的持仓数量"""
-        positions = PositionService.get_positions(client, token_id=token_id)
-        return positions[0]['shares'] if positions else 0
+    def get_positions_by_token(client) -> Dict[str, dict]:
+        """一次获取全部持仓并按 token_id 建立索引
+
+        批量查询多个token时(如分类市场的多个子市场)，先调用本方法，
+        再将结果传给 get_token_balance / get_position_by_token，避免重复请求。
+
+        Returns:
+            {token_id: 解析后的持仓, ...}
+        """
+        return {p['token_id']: p for p in PositionService.get_positions(client)
+                if p.get('token_id')}
 
     @staticmethod
-    def get_position_by_token(client, token_id: str) -> Optional[dict]:
-        """获取特定token的持仓详情"""
+    def get_token_balance(client, token_id: str,
+                          positions_by_token: Optional[Dict[str, dict]] = None) -> int:
+        """获取特定token的持仓数量
+
+        Args:
+            positions_by_token: get_positions_by_token() 的结果，传入时不再请求接口
+        """
+        position = PositionService.get_position_by_token(
+            client, token_id, positions_by_token)
+        return position['shares'] if position else 0
+
+    @staticmethod
+    def get_position_by_token(client, token_id: str,
+                              positions_by_token: Optional[Dict[str, dict]] = None) -> Optional[dict]:
+        """获取特定token的持仓详情
+
+        Args:
+            positions_by_token: get_positions_by_token() 的结果，传入时不再请求接口
+        """
+        if positions_by_token is not None:
+            return positions_by_token.get(str(token_id))
         positions = PositionService.get_positions(client, token_id=token_id)
         return positions[0] if positions else None
 
@@ -81,8 +113,11 @@ class PositionService:
         """
         positions = PositionService.get_positions(client)
 
-        total_value = sum(p.get('current_value', 0) for p in positions)
-        total_cost = sum(p.get('cost', 0) for p in positions)
+        total_value = 0.0
+        total_cost = 0.0
+        for p in positions:
+            total_value += p.get('current_value', 0)
+            total_cost += p.get('cost', 0)
         total_pnl = total_value - total_cost
         pnl_percent = (total_pnl / total_cost * 100) if total_cost > 0 else 0
 
@@ -102,7 +137,9 @@ class PositionService:
         initial_balance: int,
         expected_direction: str,
         timeout: int = 10,
-        check_interval: float = 1.0
+        check_interval: float = 1.0,
+        min_interval: float = 0.1,
+        backoff_factor: float = 1.5
     ) -> Tuple[bool, int]:
         """等待持仓更新
 
@@ -112,14 +149,17 @@ class PositionService:
             initial_balance: 初始持仓
             expected_direction: 'increase' 或 'decrease'
             timeout: 超时秒数
-            check_interval: 检查间隔秒数
+            check_interval: 最大检查间隔秒数
+            min_interval: 首次检查间隔秒数
+            backoff_factor: 每次未更新后间隔的放大倍数
 
         Returns:
             (success, new_balance)
         """
-        start_time = time.time()
+        deadline = time.monotonic() + timeout
+        interval = min(min_interval, check_interval)
 
-        while time.time() - start_time < timeout:
+        while True:
             try:
                 current = PositionService.get_token_balance(client, token_id)
 
@@ -127,9 +167,14 @@ class PositionService:
                     return True, current
                 elif expected_direction == 'decrease' and current < initial_balance:
                     return True, current
-
-                time.sleep(check_interval)
             except Exception:
-                time.sleep(check_interval)
+                pass
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            # 成交通常很快到账: 先密集轮询，之后逐步放慢到 check_interval
+            time.sleep(min(interval, remaining))
+            interval = min(interval * backoff_factor, check_interval)
 
         return False, initial_balance
@@ -2,17 +2,33 @@
 Opinion SDK 服务模块
 包含订单簿、订单构建、用户确认、市场信息、账户迭代、持仓等服务
 """
+import sys
 import time
+import random
+import threading
+from datetime import datetime
+from types import MappingProxyType
+from typing import Dict, Optional
+from itertools import starmap
+from operator import itemgetter, mul
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+import requests
+from requests.adapters import HTTPAdapter
+
 from opinion_trader.display.display import OrderbookDisplay, PositionDisplay, ProgressBar
+from opinion_trader.services.orderbook import OrderbookSnapshot
+from opinion_trader.services.market import MarketSnapshot
+
+# 无到期时间的市场排序键 (整数比较，排在所有时间戳之后)
+_NO_END_SORT_KEY = 2 ** 63
 
 
 class OrderbookService:
     """订单簿服务模块 - 统一获取和解析订单簿数据"""
 
     @staticmethod
-    def fetch(client, token_id: str, max_depth: int = 5) -> dict:
+    def fetch(client, token_id: str, max_depth: int = 5) -> OrderbookSnapshot:
         """获取并解析订单簿
 
         Args:
@@ -21,26 +37,12 @@ class OrderbookService:
             max_depth: 计算深度的最大档位数
 
         Returns:
-            {
-                'success': bool,
-                'bids': [(price, size), ...],  # 按价格降序
-                'asks': [(price, size), ...],  # 按价格升序
-                'bid1_price': float,           # 买1价
-                'ask1_price': float,           # 卖1价
-                'bid1_size': float,            # 买1量
-                'ask1_size': float,            # 卖1量
-                'bid_depth': float,            # 买盘深度(美元)
-                'ask_depth': float,            # 卖盘深度(美元)
-                'spread': float,               # 价差
-                'mid_price': float,            # 中间价
-                'raw': orderbook对象,
-                'error': str (如果失败)
-            }
+            OrderbookSnapshot (字段说明见 OrderbookSnapshot)
         """
         try:
             response = client.get_orderbook(token_id=token_id)
             if response.errno != 0:
-                return {'success': False, 'error': response.errmsg if hasattr(response, 'errmsg') else '获取订单簿失败'}
+                return OrderbookSnapshot(success=False, error=response.errmsg if hasattr(response, 'errmsg') else '获取订单簿失败')
 
             orderbook = response.result
 
@@ -55,8 +57,8 @@ class OrderbookService:
             asks = [(float(a.price), float(a.size)) for a in asks_sorted]
 
             # 计算深度
-            bid_depth = sum(price * size for price, size in bids[:max_depth])
-            ask_depth = sum(price * size for price, size in asks[:max_depth])
+            bid_depth = sum(starmap(mul, bids[:max_depth]))
+            ask_depth = sum(starmap(mul, asks[:max_depth]))
 
             # 买1卖1
             bid1_price = bids[0][0] if bids else 0
@@ -69,37 +71,37 @@ class OrderbookService:
             mid_price = (bid1_price + ask1_price) / \
                 2 if bid1_price > 0 and ask1_price > 0 else 0
 
-            return {
-                'success': True,
-                'bids': bids,
-                'asks': asks,
-                'bid1_price': bid1_price,
-                'ask1_price': ask1_price,
-                'bid1_size': bid1_size,
-                'ask1_size': ask1_size,
-                'bid_depth': bid_depth,
-                'ask_depth': ask_depth,
-                'spread': spread,
-                'mid_price': mid_price,
-                'raw': orderbook
-            }
+            return OrderbookSnapshot(
+                success=True,
+                bids=bids,
+                asks=asks,
+                bid1_price=bid1_price,
+                ask1_price=ask1_price,
+                bid1_size=bid1_size,
+                ask1_size=ask1_size,
+                bid_depth=bid_depth,
+                ask_depth=ask_depth,
+                spread=spread,
+                mid_price=mid_price,
+                raw=orderbook
+            )
         except Exception as e:
-            return {'success': False, 'error': str(e)}
+            return OrderbookSnapshot(success=False, error=str(e))
 
     @staticmethod
     def fetch_and_display(client, token_id: str, title: str = "盘口信息",
                           mode: str = "simple", max_rows: int = 5,
-                          format_price_func=None) -> dict:
+                          format_price_func=None) -> OrderbookSnapshot:
         """获取订单簿并显示
 
         Returns:
             同 fetch() 返回值
         """
         result = OrderbookService.fetch(client, token_id, max_depth=max_rows)
-        if result['success']:
+        if result.success:
             OrderbookDisplay.show(
-                bids=result['bids'],
-                asks=result['asks'],
+                bids=result.bids,
+                asks=result.asks,
                 mode=mode,
                 max_rows=max_rows,
                 title=title,
@@ -108,7 +110,7 @@ class OrderbookService:
         return result
 
     @staticmethod
-    def check_liquidity(orderbook_result: dict, required_amount: float,
+    def check_liquidity(orderbook_result: OrderbookSnapshot, required_amount: float,
                         side: str = 'buy') -> dict:
         """检查流动性是否充足
 
@@ -125,10 +127,10 @@ class OrderbookService:
                 'shortage': float
             }
         """
-        if not orderbook_result.get('success'):
+        if not orderbook_result.success:
             return {'sufficient': False, 'available': 0, 'required': required_amount, 'shortage': required_amount}
 
-        available = orderbook_result['ask_depth'] if side == 'buy' else orderbook_result['bid_depth']
+        available = orderbook_result.ask_depth if side == 'buy' else orderbook_result.bid_depth
         shortage = max(0, required_amount - available)
 
         return {
@@ -139,7 +141,7 @@ class OrderbookService:
         }
 
     @staticmethod
-    def get_price_at_level(orderbook_result: dict, side: str, level: int = 0, fallback: bool = True) -> float:
+    def get_price_at_level(orderbook_result: OrderbookSnapshot, side: str, level: int = 0, fallback: bool = True) -> float:
         """获取指定档位的价格
 
         Args:
@@ -151,16 +153,16 @@ class OrderbookService:
         Returns:
             价格，如果失败返回 0
         """
-        if not orderbook_result.get('success'):
+        if not orderbook_result.success:
             return 0
 
-        prices = orderbook_result['bids'] if side == 'bid' else orderbook_result['asks']
+        prices = orderbook_result.bids if side == 'bid' else orderbook_result.asks
         if not prices:
             return 0
 
         if len(prices) > level:
             return prices[level][0]
-        elif fallback and prices:
+        elif fallback:
             return prices[0][0]
         return 0
 
@@ -292,11 +294,14 @@ class OrderBuilder:
 
     @staticmethod
     def execute_with_retry(client, order, max_retries: int = 2,
-                           translate_error_func=None, remark: str = '') -> dict:
-        """带重试的订单执行
+                           translate_error_func=None, remark: str = '',
+                           initial_delay: float = 0.1, max_delay: float = 2.0) -> dict:
+        """带重试的订单执行 (指数退避 + 随机抖动，避免多账户同时重试)
 
         Args:
             max_retries: 最大重试次数
+            initial_delay: 首次重试等待秒数
+            max_delay: 最大等待秒数
             其他参数同 execute()
         """
         last_error = None
@@ -307,10 +312,26 @@ class OrderBuilder:
                 return result
             last_error = result.get('error', '未知错误')
             if attempt < max_retries:
-                time.sleep(0.5)
+                delay = initial_delay * (2 ** attempt) + \
+                    random.uniform(0, initial_delay)
+                time.sleep(min(max_delay, delay))
         return {'success': False, 'error': last_error}
 
 
+# yes_no 视为确认的输入 (已转小写)
+_YES_ANSWERS = frozenset(('y', 'yes', '是'))
+
+
+def _retry_input(prompt: str) -> str:
+    """重新输入时使用：直接写提示并读取一行，不经过 input() 的 readline 处理"""
+    sys.stdout.write(prompt)
+    sys.stdout.flush()
+    line = sys.stdin.readline()
+    if not line:
+        raise EOFError
+    return line.rstrip('\n')
+
+
 class UserConfirmation:
     """用户确认交互模块 - 统一处理用户输入确认"""
 
@@ -329,7 +350,7 @@ class UserConfirmation:
         response = input(f"{prompt} {suffix}: ").strip().lower()
         if not response:
             return default
-        return response in ('y', 'yes', '是')
+        return response in _YES_ANSWERS
 
     @staticmethod
     def confirm_keyword(prompt: str, keyword: str = 'yes') -> bool:
@@ -372,29 +393,27 @@ class UserConfirmation:
         Returns:
             int: 选择的索引 (1-based), 0表示取消
         """
-        print(f"\n{title}")
+        lines = [f"\n{title}"]
         for i, opt in enumerate(options, 1):
             if isinstance(opt, tuple):
                 label, desc = opt
-                print(f"  [{i}] {label} - {desc}")
+                lines.append(f"  [{i}] {label} - {desc}")
             else:
-                print(f"  [{i}] {opt}")
+                lines.append(f"  [{i}] {opt}")
+        print('\n'.join(lines))
 
         cancel_hint = " (留空返回)" if allow_cancel else ""
+        # 合法输入预先建表，直接按字符串查找
+        valid = {str(i): i for i in range(1, len(options) + 1)}
+        if allow_cancel:
+            valid[''] = 0
+        read = input  # 首次提示保留 input() (行编辑/历史)，重试改用 _retry_input
         while True:
-            choice = input(f"\n请选择{cancel_hint}: ").strip()
-            if not choice:
-                if allow_cancel:
-                    return 0
-                print("  请输入有效选项")
-                continue
-            try:
-                idx = int(choice)
-                if 1 <= idx <= len(options):
-                    return idx
-            except ValueError:
-                pass
-            print("  无效输入，请重新选择")
+            choice = read(f"\n请选择{cancel_hint}: ").strip()
+            if choice in valid:
+                return valid[choice]
+            print("  无效输入，请重新选择" if choice else "  请输入有效选项")
+            read = _retry_input
 
     @staticmethod
     def confirm_with_summary(title: str, items: list, keyword: str = 'done') -> bool:
@@ -427,40 +446,47 @@ class UserConfirmation:
             action: 'continue'/'skip'/'cancel'
             skip_remarks: 需跳过的账户备注集合
         """
-        if not insufficient_list:
-            return ('continue', None)
-
-        print(f"\n[!] 余额不足警告:")
-        for item in insufficient_list:
-            if len(item) == 3:
-                remark, balance, required = item
-            else:
-                _, remark, balance, required = item
-            print(f"   [{remark}] 余额${balance:.2f} < 需要${required:.2f}")
-
-        options = [
-            ("继续", "忽略警告继续执行"),
-            ("跳过", "跳过余额不足的账户"),
-            ("停止", "取消操作")
-        ]
-        choice = UserConfirmation.select_option(
-            "请选择操作", options, allow_cancel=False)
-
-        if choice == 1:
-            return ('continue', None)
-        elif choice == 2:
-            skip_remarks = set()
-            for item in insufficient_list:
-                remark = item[0] if len(item) == 3 else item[1]
-                skip_remarks.add(remark)
-            return ('skip', skip_remarks)
-        else:
-            return ('cancel', None)
+        return handle_insufficient_balance(insufficient_list)
 
 
 class MarketInfoService:
     """市场信息服务 - 统一获取市场详情"""
 
+    # 市场类型缓存 {market_id: 'categorical'/'binary'}
+    _market_type_cache: Dict[int, str] = {}
+
+    @staticmethod
+    def _extract_token_ids(data) -> tuple:
+        """从二元市场数据中提取 Yes/No Token ID (兼容多种SDK返回格式)
+
+        Returns:
+            (yes_token_id, no_token_id, tokens)
+        """
+        yes_token_id = None
+        no_token_id = None
+        tokens = []
+
+        yes_token = getattr(data, 'yes_token', None)
+        if yes_token:
+            no_token = getattr(data, 'no_token', None)
+            yes_token_id = str(yes_token.token_id)
+            no_token_id = str(no_token.token_id) if no_token else None
+        elif getattr(data, 'yes_token_id', None):
+            yes_token_id = str(data.yes_token_id)
+            no_token_id = str(data.no_token_id) if hasattr(
+                data, 'no_token_id') else None
+        elif getattr(data, 'tokens', None):
+            tokens = data.tokens
+            for token in tokens:
+                ticker = getattr(token, 'ticker', None) or ''
+                ticker = ticker.upper()
+                if 'YES' in ticker:
+                    yes_token_id = str(token.token_id)
+                elif 'NO' in ticker:
+                    no_token_id = str(token.token_id)
+
+        return yes_token_id, no_token_id, tokens
+
     @staticmethod
     def get_market_info(client, market_id: int) -> dict:
         """获取市场信息 (自动判断分类/二元市场)
@@ -482,11 +508,38 @@ class MarketInfoService:
                 'error': str (如果失败)
             }
         """
+        # 已知类型的市场先请求对应接口，二元市场无需先走一次分类接口
+        probes = [('categorical', MarketInfoService._probe_categorical),
+                  ('binary', MarketInfoService._probe_binary)]
+        if MarketInfoService._guess_market_type(market_id) == 'binary':
+            probes.reverse()
+
         # 记录API错误信息，用于最终提示
-        cat_error = None
-        bin_error = None
+        errors = {}
+        for market_type, probe in probes:
+            result, errors[market_type] = probe(client, market_id)
+            if result:
+                MarketInfoService._market_type_cache[market_id] = market_type
+                return result
+
+        # 两种方式都失败，返回详细错误
+        error_msg = errors.get('binary') or errors.get('categorical') or '未知错误'
+        return {'success': False, 'error': f'市场不存在或已下架，请检查市场ID ({error_msg})'}
 
-        # 先尝试作为分类市场获取
+    @staticmethod
+    def _guess_market_type(market_id: int) -> Optional[str]:
+        """根据历史查询结果或市场列表缓存推断市场类型 ('categorical'/'binary')"""
+        market_type = MarketInfoService._market_type_cache.get(market_id)
+        if market_type:
+            return market_type
+        listed = MarketListService.get_market_by_id(market_id)
+        if listed:
+            return 'categorical' if listed['is_categorical'] else 'binary'
+        return None
+
+    @staticmethod
+    def _probe_categorical(client, market_id: int) -> tuple:
+        """按分类市场获取，返回 (result, error)"""
         try:
             cat_resp = client.get_categorical_market(market_id=market_id)
             if cat_resp.errno == 0 and cat_resp.result and cat_resp.result.data:
@@ -504,39 +557,22 @@ class MarketInfoService:
                     'no_token_id': None,
                     'tokens': [],
                     'raw': data
-                }
+                }, None
             else:
-                cat_error = cat_resp.errmsg if hasattr(
+                return None, cat_resp.errmsg if hasattr(
                     cat_resp, 'errmsg') and cat_resp.errmsg else f'errno={cat_resp.errno}'
         except Exception as e:
-            cat_error = str(e)
+            return None, str(e)
 
-        # 尝试作为二元市场获取
+    @staticmethod
+    def _probe_binary(client, market_id: int) -> tuple:
+        """按二元市场获取，返回 (result, error)"""
         try:
             bin_resp = client.get_market(market_id=market_id)
             if bin_resp.errno == 0 and bin_resp.result and bin_resp.result.data:
                 data = bin_resp.result.data
-                yes_token_id = None
-                no_token_id = None
-                tokens = []
-
-                # 尝试多种方式获取token
-                if hasattr(data, 'yes_token') and data.yes_token:
-                    yes_token_id = str(data.yes_token.token_id)
-                    no_token_id = str(
-                        data.no_token.token_id) if data.no_token else None
-                elif hasattr(data, 'yes_token_id') and data.yes_token_id:
-                    yes_token_id = str(data.yes_token_id)
-                    no_token_id = str(data.no_token_id) if hasattr(
-                        data, 'no_token_id') else None
-                elif hasattr(data, 'tokens') and data.tokens:
-                    tokens = data.tokens
-                    for token in tokens:
-                        ticker = token.ticker.upper() if hasattr(token, 'ticker') else ''
-                        if 'YES' in ticker:
-                            yes_token_id = str(token.token_id)
-                        elif 'NO' in ticker:
-                            no_token_id = str(token.token_id)
+                yes_token_id, no_token_id, tokens = MarketInfoService._extract_token_ids(
+                    data)
 
                 return {
                     'success': True,
@@ -547,17 +583,12 @@ class MarketInfoService:
                     'no_token_id': no_token_id,
                     'tokens': tokens,
                     'raw': data
-                }
+                }, None
             else:
-                bin_error = bin_resp.errmsg if hasattr(
+                return None, bin_resp.errmsg if hasattr(
                     bin_resp, 'errmsg') and bin_resp.errmsg else f'errno={bin_resp.errno}'
         except Exception as e:
-            bin_error = str(e)
-
-        # 两种方式都失败，返回详细错误
-        # 优先使用二元市场的错误信息（更常见）
-        error_msg = bin_error or cat_error or '未知错误'
-        return {'success': False, 'error': f'市场不存在或已下架，请检查市场ID ({error_msg})'}
+            return None, str(e)
 
     @staticmethod
     def get_child_market_info(client, child_market_id: int) -> dict:
@@ -578,24 +609,8 @@ class MarketInfoService:
                 return {'success': False, 'error': '获取子市场失败'}
 
             data = resp.result.data
-            yes_token_id = None
-            no_token_id = None
-
-            if hasattr(data, 'yes_token') and data.yes_token:
-                yes_token_id = str(data.yes_token.token_id)
-                no_token_id = str(
-                    data.no_token.token_id) if data.no_token else None
-            elif hasattr(data, 'yes_token_id'):
-                yes_token_id = str(data.yes_token_id)
-                no_token_id = str(data.no_token_id) if hasattr(
-                    data, 'no_token_id') else None
-            elif hasattr(data, 'tokens') and data.tokens:
-                for token in data.tokens:
-                    ticker = token.ticker.upper() if hasattr(token, 'ticker') else ''
-                    if 'YES' in ticker:
-                        yes_token_id = str(token.token_id)
-                    elif 'NO' in ticker:
-                        no_token_id = str(token.token_id)
+            yes_token_id, no_token_id, _ = MarketInfoService._extract_token_ids(
+                data)
 
             return {
                 'success': True,
@@ -663,8 +678,8 @@ class MarketInfoService:
                 try:
                     ob_yes = OrderbookService.fetch(
                         client, child_info['yes_token_id'])
-                    if ob_yes['success']:
-                        child_data['yes_price'] = ob_yes['bid1_price']
+                    if ob_yes.success:
+                        child_data['yes_price'] = ob_yes.bid1_price
                 except Exception:
                     pass
 
@@ -672,8 +687,8 @@ class MarketInfoService:
                     if child_info['no_token_id']:
                         ob_no = OrderbookService.fetch(
                             client, child_info['no_token_id'])
-                        if ob_no['success']:
-                            child_data['no_price'] = ob_no['bid1_price']
+                        if ob_no.success:
+                            child_data['no_price'] = ob_no.bid1_price
                 except Exception:
                     pass
 
@@ -689,6 +704,9 @@ class MarketInfoService:
 class AccountIterator:
     """账户迭代器 - 统一处理多账户操作"""
 
+    # 进度条最小刷新间隔（秒），避免账户多时频繁写终端
+    PROGRESS_INTERVAL = 0.05
+
     def __init__(self, configs: list, clients: list):
         """
         Args:
@@ -697,6 +715,37 @@ class AccountIterator:
         """
         self.configs = configs
         self.clients = clients
+        self._pool = None
+        self._max_workers = 0
+
+    def _get_pool(self, max_workers: int) -> ThreadPoolExecutor:
+        """获取共享线程池 (懒创建，并发上限提高时重建)"""
+        if self._pool is None or max_workers > self._max_workers:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False)
+            self._max_workers = max(max_workers, self._max_workers)
+            self._pool = ThreadPoolExecutor(max_workers=self._max_workers)
+        return self._pool
+
+    def close(self):
+        """关闭共享线程池"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+    def _resolve(self, selected_indices: list) -> list:
+        """将 1-based 账户索引转换为 [(acc_idx, config, client), ...]，跳过越界索引"""
+        count = len(self.configs)
+        configs = self.configs
+        clients = self.clients
+        return [(acc_idx, configs[acc_idx - 1], clients[acc_idx - 1])
+                for acc_idx in selected_indices if 1 <= acc_idx <= count]
 
     def iterate(self, selected_indices: list, callback,
                 show_progress: bool = True, progress_prefix: str = '处理账户') -> dict:
@@ -712,19 +761,19 @@ class AccountIterator:
             {acc_idx: result, ...}
         """
         results = {}
-        total = len(selected_indices)
         errors = []
+        pairs = self._resolve(selected_indices)
+        total = len(pairs)
 
-        for i, acc_idx in enumerate(selected_indices):
-            if acc_idx < 1 or acc_idx > len(self.configs):
-                continue
-
-            config = self.configs[acc_idx - 1]
-            client = self.clients[acc_idx - 1]
+        last_render = 0.0
 
+        for i, (acc_idx, config, client) in enumerate(pairs):
             if show_progress:
-                ProgressBar.show_progress(
-                    i, total, prefix=progress_prefix, suffix=config.remark)
+                now = time.monotonic()
+                if i == total - 1 or now - last_render >= self.PROGRESS_INTERVAL:
+                    ProgressBar.show_progress(
+                        i, total, prefix=progress_prefix, suffix=config.remark)
+                    last_render = now
 
             try:
                 results[acc_idx] = callback(acc_idx, client, config)
@@ -762,29 +811,32 @@ class AccountIterator:
             {acc_idx: result, ...}
         """
         results = {}
-        total = len(selected_indices)
+        pairs = self._resolve(selected_indices)
+        total = len(pairs)
         completed = 0
+        last_render = 0.0
 
-        def worker(acc_idx):
-            config = self.configs[acc_idx - 1]
-            client = self.clients[acc_idx - 1]
+        def worker(acc_idx, config, client):
             return acc_idx, callback(acc_idx, client, config)
 
-        with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = {executor.submit(worker, idx): idx for idx in selected_indices
-                       if 1 <= idx <= len(self.configs)}
+        executor = self._get_pool(max_workers)
+        futures = {executor.submit(worker, acc_idx, config, client): acc_idx
+                   for acc_idx, config, client in pairs}
 
-            for future in as_completed(futures):
-                try:
-                    acc_idx, result = future.result()
-                    results[acc_idx] = result
-                except Exception as e:
-                    acc_idx = futures[future]
-                    results[acc_idx] = {'error': str(e)}
-
-                completed += 1
-                if show_progress:
+        for future in as_completed(futures):
+            try:
+                acc_idx, result = future.result()
+                results[acc_idx] = result
+            except Exception as e:
+                acc_idx = futures[future]
+                results[acc_idx] = {'error': str(e)}
+
+            completed += 1
+            if show_progress:
+                now = time.monotonic()
+                if completed == total or now - last_render >= self.PROGRESS_INTERVAL:
                     ProgressBar.show_progress(completed, total, prefix='并行处理')
+                    last_render = now
 
         return results
 
@@ -855,38 +907,70 @@ class PositionService:
             positions = response.result.list if hasattr(
                 response.result, 'list') else []
             result = []
+            target_token = str(token_id) if token_id else None
 
             for p in positions:
-                shares = int(
-                    float(p.shares_owned if hasattr(p, 'shares_owned') else 0))
-                if shares <= 0:
-                    continue
+                p_tok = getattr(p, 'token_id', None)
+                p_tok = str(p_tok) if p_tok is not None else None
 
-                # 过滤
-                if token_id and str(p.token_id) != str(token_id):
+                # 过滤 (先比较 token，避免无谓的数值解析)
+                if target_token and p_tok != target_token:
                     continue
-                if market_id and hasattr(p, 'market_id') and p.market_id != market_id:
+                p_mkt = getattr(p, 'market_id', None)
+                if market_id and p_mkt is not None and p_mkt != market_id:
+                    continue
+
+                shares = int(float(getattr(p, 'shares_owned', 0)))
+                if shares <= 0:
                     continue
 
                 parsed = PositionDisplay.parse_sdk_position(p)
                 if parsed:
-                    parsed['token_id'] = str(p.token_id) if hasattr(
-                        p, 'token_id') else None
+                    parsed['token_id'] = p_tok
                     result.append(parsed)
+                    # 同一 token 只会有一条持仓
+                    if target_token:
+                        break
 
             return result
         except Exception:
             return []
 
     @staticmethod
-    def get_token_balance(client, token_id: str) -> int:
-        """获取特定token的持仓数量"""
-        positions = PositionService.get_positions(client, token_id=token_id)
-        return positions[0]['shares'] if positions else 0
+    def get_positions_by_token(client) -> Dict[str, dict]:
+        """一次获取全部持仓并按 token_id 建立索引
+
+        批量查询多个token时(如分类市场的多个子市场)，先调用本方法，
+        再将结果传给 get_token_balance / get_position_by_token，避免重复请求。
+
+        Returns:
+            {token_id: 解析后的持仓, ...}
+        """
+        return {p['token_id']: p for p in PositionService.get_positions(client)
+                if p.get('token_id')}
 
     @staticmethod
-    def get_position_by_token(client, token_id: str) -> dict:
-        """获取特定token的持仓详情"""
+    def get_token_balance(client, token_id: str,
+                          positions_by_token: Optional[Dict[str, dict]] = None) -> int:
+        """获取特定token的持仓数量
+
+        Args:
+            positions_by_token: get_positions_by_token() 的结果，传入时不再请求接口
+        """
+        position = PositionService.get_position_by_token(
+            client, token_id, positions_by_token)
+        return position['shares'] if position else 0
+
+    @staticmethod
+    def get_position_by_token(client, token_id: str,
+                              positions_by_token: Optional[Dict[str, dict]] = None) -> Optional[dict]:
+        """获取特定token的持仓详情
+
+        Args:
+            positions_by_token: get_positions_by_token() 的结果，传入时不再请求接口
+        """
+        if positions_by_token is not None:
+            return positions_by_token.get(str(token_id))
         positions = PositionService.get_positions(client, token_id=token_id)
         return positions[0] if positions else None
 
@@ -906,8 +990,11 @@ class PositionService:
         """
         positions = PositionService.get_positions(client)
 
-        total_value = sum(p.get('current_value', 0) for p in positions)
-        total_cost = sum(p.get('cost', 0) for p in positions)
+        total_value = 0.0
+        total_cost = 0.0
+        for p in positions:
+            total_value += p.get('current_value', 0)
+            total_cost += p.get('cost', 0)
         total_pnl = total_value - total_cost
         pnl_percent = (total_pnl / total_cost * 100) if total_cost > 0 else 0
 
@@ -923,7 +1010,8 @@ class PositionService:
     @staticmethod
     def wait_for_position_update(client, token_id: str, initial_balance: int,
                                  expected_direction: str, timeout: int = 10,
-                                 check_interval: float = 1.0) -> tuple:
+                                 check_interval: float = 1.0, min_interval: float = 0.1,
+                                 backoff_factor: float = 1.5) -> tuple:
         """等待持仓更新
 
         Args:
@@ -932,14 +1020,17 @@ class PositionService:
             initial_balance: 初始持仓
             expected_direction: 'increase' 或 'decrease'
             timeout: 超时秒数
-            check_interval: 检查间隔秒数
+            check_interval: 最大检查间隔秒数
+            min_interval: 首次检查间隔秒数
+            backoff_factor: 每次未更新后间隔的放大倍数
 
         Returns:
             (success, new_balance)
         """
-        start_time = time.time()
+        deadline = time.monotonic() + timeout
+        interval = min(min_interval, check_interval)
 
-        while time.time() - start_time < timeout:
+        while True:
             try:
                 current = PositionService.get_token_balance(client, token_id)
 
@@ -947,14 +1038,32 @@ class PositionService:
                     return True, current
                 elif expected_direction == 'decrease' and current < initial_balance:
                     return True, current
-
-                time.sleep(check_interval)
             except Exception:
-                time.sleep(check_interval)
+                pass
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            # 成交通常很快到账: 先密集轮询，之后逐步放慢到 check_interval
+            time.sleep(min(interval, remaining))
+            interval = min(interval * backoff_factor, check_interval)
 
         return False, initial_balance
 
 
+def _normalize_insufficient(items: list) -> list:
+    """统一为 (remark, balance, required)，兼容带 idx 的四元组 (后三项位置固定)"""
+    return [tuple(item[-3:]) for item in items if len(item) in (3, 4)]
+
+
+_INSUFFICIENT_BALANCE_MENU = (
+    "\n请选择操作:\n"
+    "  [1] 继续 - 忽略警告继续执行\n"
+    "  [2] 跳过 - 跳过余额不足的账户，仅使用余额充足的账户\n"
+    "  [3] 停止 - 取消操作"
+)
+
+
 def handle_insufficient_balance(insufficient_accounts: list) -> tuple:
     """处理余额不足的账户
 
@@ -969,38 +1078,29 @@ def handle_insufficient_balance(insufficient_accounts: list) -> tuple:
     if not insufficient_accounts:
         return ('continue', None)
 
-    print(f"\n[!] 余额不足警告:")
-    for item in insufficient_accounts:
-        if len(item) == 3:
-            remark, balance, required = item
-            print(f"   [{remark}] 余额${balance:.2f} < 需要${required:.2f}")
-        elif len(item) == 4:
-            _, remark, balance, required = item
-            print(f"   [{remark}] 余额${balance:.2f} < 需要${required:.2f}")
+    normalized = _normalize_insufficient(insufficient_accounts)
+    skip_remarks = {remark for remark, _, _ in normalized}
 
-    print(f"\n请选择操作:")
-    print(f"  [1] 继续 - 忽略警告继续执行")
-    print(f"  [2] 跳过 - 跳过余额不足的账户，仅使用余额充足的账户")
-    print(f"  [3] 停止 - 取消操作")
+    lines = ["\n[!] 余额不足警告:"]
+    lines.extend(f"   [{remark}] 余额${balance:.2f} < 需要${required:.2f}"
+                 for remark, balance, required in normalized)
+    lines.append(_INSUFFICIENT_BALANCE_MENU)
+    # 一次写出并立即刷新，避免提示在 input() 之前被缓冲
+    sys.stdout.write('\n'.join(lines) + '\n')
+    sys.stdout.flush()
 
+    read = input  # 首次提示保留 input() (行编辑/历史)，重试改用 _retry_input
     while True:
-        choice = input("\n请选择 (1/2/3): ").strip()
+        choice = read("\n请选择 (1/2/3): ").strip()
         if choice == '1':
             return ('continue', None)
         elif choice == '2':
-            # 获取需要跳过的账户备注列表
-            skip_remarks = set()
-            for item in insufficient_accounts:
-                if len(item) == 3:
-                    remark, _, _ = item
-                elif len(item) == 4:
-                    _, remark, _, _ = item
-                skip_remarks.add(remark)
             return ('skip', skip_remarks)
         elif choice == '3':
             return ('cancel', None)
         else:
             print("  无效输入，请输入 1、2 或 3")
+            read = _retry_input
 
 
 # ============ 市场列表服务 ============
@@ -1012,16 +1112,13 @@ class MarketListService:
     支持：
     - 程序启动时自动加载
     - 后台定期自动刷新
-    - 线程安全的读写操作
+    - 线程安全的读写操作 (写入时整体替换不可变快照，读取无锁)
     """
 
-    import threading
-
-    _markets_cache = []  # 市场列表缓存
-    _cache_time = 0  # 缓存时间
+    _snapshot = MarketSnapshot()  # 市场列表快照 (只整体替换)
     _loading = False  # 是否正在加载
     _loaded = False  # 是否已加载完成
-    _lock = threading.Lock()  # 读写锁
+    _load_lock = threading.Lock()  # 加载锁 (非阻塞获取，同一时间只有一个加载；读取无需加锁)
 
     # 后台刷新相关
     _client = None  # SDK客户端引用
@@ -1029,10 +1126,19 @@ class MarketListService:
     _refresh_interval = 60  # 刷新间隔（秒）
     _refresh_thread = None  # 刷新线程
     _stop_event = threading.Event()  # 停止事件
+    _refresh_event = threading.Event()  # 唤醒刷新线程事件
+    _initial_load_done = threading.Event()  # 首次加载结束事件 (无论成功与否)
 
     # Opinion.trade 市场链接前缀
     MARKET_URL_PREFIX = "https://opinion.trade/market/"
 
+    # HTTP API 回退地址 (复用连接，避免每次刷新重新握手)
+    HTTP_API_BASE = "https://proxy.opinion.trade:8443"
+    _http_session = None
+
+    # 完整列表渲染缓存 {(cache_time, max_count): 文本}，发布新快照时清空
+    _display_cache: dict = {}
+
     @classmethod
     def initialize(cls, client, auto_refresh: bool = True, refresh_interval: int = 60):
         """初始化市场列表服务（程序启动时调用）
@@ -1042,14 +1148,12 @@ class MarketListService:
             auto_refresh: 是否启用自动刷新
             refresh_interval: 刷新间隔（秒），默认60秒
         """
-        import threading
-
-        with cls._lock:
-            cls._client = client
-            cls._refresh_interval = refresh_interval
+        cls._client = client
+        cls._refresh_interval = refresh_interval
 
-        # 立即执行首次加载
-        cls._fetch_and_update()
+        # 首次加载放到后台线程，不阻塞程序启动
+        threading.Thread(target=cls._fetch_and_update, daemon=True,
+                         name="MarketListInitialLoad").start()
 
         # 启动自动刷新
         if auto_refresh:
@@ -1058,19 +1162,21 @@ class MarketListService:
     @classmethod
     def start_auto_refresh(cls):
         """启动后台自动刷新线程"""
-        import threading
-
         if cls._auto_refresh_enabled:
             return
 
         cls._auto_refresh_enabled = True
-        cls._stop_event.clear()
+        # 每个刷新线程使用新的事件对象：上一次 stop 留下的唤醒信号不会让新线程立即刷新，
+        # join 超时仍在运行的旧线程也只看自己的停止事件
+        stop_event = cls._stop_event = threading.Event()
+        refresh_event = cls._refresh_event = threading.Event()
 
         def refresh_loop():
-            while not cls._stop_event.is_set():
-                # 等待刷新间隔
-                cls._stop_event.wait(cls._refresh_interval)
-                if cls._stop_event.is_set():
+            while not stop_event.is_set():
+                # 等待刷新间隔，refresh_now() / stop_auto_refresh() 可提前唤醒
+                refresh_event.wait(cls._refresh_interval)
+                refresh_event.clear()
+                if stop_event.is_set():
                     break
                 # 执行刷新
                 cls._fetch_and_update()
@@ -1084,6 +1190,7 @@ class MarketListService:
         """停止后台自动刷新"""
         cls._auto_refresh_enabled = False
         cls._stop_event.set()
+        cls._refresh_event.set()
         if cls._refresh_thread and cls._refresh_thread.is_alive():
             cls._refresh_thread.join(timeout=2)
         cls._refresh_thread = None
@@ -1091,27 +1198,35 @@ class MarketListService:
     @classmethod
     def _fetch_and_update(cls):
         """获取并更新市场数据（内部方法）"""
-        import threading
-
-        if cls._loading or cls._client is None:
+        if cls._client is None:
             return
 
-        with cls._lock:
-            if cls._loading:
-                return
-            cls._loading = True
+        # 已有加载在进行时直接返回，不排队等待
+        if not cls._load_lock.acquire(blocking=False):
+            return
+        cls._loading = True
 
         try:
             markets = cls._fetch_all_markets(cls._client)
-            with cls._lock:
-                cls._markets_cache = markets
-                cls._cache_time = time.time()
-                cls._loaded = True
+            cls._publish(markets)
         except Exception:
             pass  # 静默失败，保留旧缓存
         finally:
-            with cls._lock:
-                cls._loading = False
+            cls._loading = False
+            cls._load_lock.release()
+            cls._initial_load_done.set()
+
+    @classmethod
+    def _publish(cls, markets: list):
+        """发布新的市场列表快照 (整体替换引用，读取方拿到的旧快照不受影响)
+
+        单个市场以只读视图发布，读取方可直接返回引用而无需复制。
+        """
+        frozen = tuple(MappingProxyType(m) for m in markets)
+        by_id = MappingProxyType({m['market_id']: m for m in frozen})
+        cls._snapshot = MarketSnapshot(frozen, by_id, time.time())
+        cls._display_cache = {}
+        cls._loaded = True
 
     @classmethod
     def start_background_fetch(cls, client, callback=None):
@@ -1121,49 +1236,51 @@ class MarketListService:
             client: SDK客户端
             callback: 加载完成后的回调函数（已废弃，保留兼容）
         """
-        import threading
-
         # 如果已经初始化过，直接返回
         if cls._client is not None and cls._loaded:
             if callback:
-                callback(cls._markets_cache)
+                callback(list(cls._snapshot.markets))
             return
 
         # 使用新的初始化方法
         cls._client = client
 
-        if cls._loading:
+        if not cls._load_lock.acquire(blocking=False):
             return
-
-        with cls._lock:
-            cls._loading = True
+        cls._loading = True
 
         def fetch_markets():
             try:
                 markets = cls._fetch_all_markets(client)
-                with cls._lock:
-                    cls._markets_cache = markets
-                    cls._cache_time = time.time()
-                    cls._loaded = True
+                cls._publish(markets)
                 if callback:
                     callback(markets)
             except Exception as e:
                 pass  # 静默失败
             finally:
-                with cls._lock:
-                    cls._loading = False
+                cls._loading = False
+                cls._load_lock.release()
+                cls._initial_load_done.set()
 
         thread = threading.Thread(target=fetch_markets, daemon=True)
         thread.start()
 
+    @classmethod
+    def _get_http_session(cls):
+        """获取复用连接的 HTTP 会话（懒创建）"""
+        if cls._http_session is None:
+            session = requests.Session()
+            session.mount(cls.HTTP_API_BASE, HTTPAdapter(
+                pool_connections=2, pool_maxsize=4))
+            cls._http_session = session
+        return cls._http_session
+
     @classmethod
     def _fetch_all_markets(cls, client, limit: int = 50) -> list:
         """获取所有活跃市场并按到期时间排序
 
         优先使用 SDK 的 get_markets 方法，失败时回退到 HTTP API
         """
-        from datetime import datetime
-
         markets = []
 
         # 方法1: 使用 SDK 的 get_markets 方法
@@ -1204,7 +1321,11 @@ class MarketListService:
                     markets.append({
                         'market_id': market_id,
                         'title': title,
+                        'title_lower': title.lower(),  # 搜索用
+                        'title_short': title[:50] + '...' if len(title) > 50 else title,  # 列表显示用
+                        'market_id_str': str(market_id),
                         'end_time': end_time,
+                        'sort_key': cutoff_at or _NO_END_SORT_KEY,  # 排序用，无到期时间排最后
                         'end_time_str': end_time.strftime('%m-%d %H:%M') if end_time else '-',
                         'is_categorical': is_cat,
                         'child_markets': child_markets,  # 预加载的子市场
@@ -1215,24 +1336,23 @@ class MarketListService:
 
                 if markets:
                     # 按到期时间排序（最近到期的在前，None 排最后）
-                    markets.sort(
-                        key=lambda x: x['end_time'] if x['end_time'] else datetime.max)
+                    markets.sort(key=itemgetter('sort_key'))
                     return markets
         except Exception:
             pass  # SDK 方法失败，尝试 HTTP API
 
         # 方法2: 回退到 HTTP API (兼容旧版本)
         try:
-            import requests
+            session = cls._get_http_session()
             urls_to_try = [
-                "https://proxy.opinion.trade:8443/api/bsc/api/v2/markets",
-                "https://proxy.opinion.trade:8443/api/bsc/api/v2/market/list",
+                f"{cls.HTTP_API_BASE}/api/bsc/api/v2/markets",
+                f"{cls.HTTP_API_BASE}/api/bsc/api/v2/market/list",
             ]
 
             for url in urls_to_try:
                 try:
                     params = {'chainId': 56, 'limit': limit}
-                    response = requests.get(url, params=params, timeout=15)
+                    response = session.get(url, params=params, timeout=15)
 
                     if response.status_code == 200:
                         data = response.json()
@@ -1244,28 +1364,34 @@ class MarketListService:
                                 market_list = result
 
                             for m in market_list:
+                                market_id = m.get(
+                                    'marketId') or m.get('market_id')
+                                if not market_id:
+                                    continue
                                 end_time_ms = m.get(
                                     'endTime', 0) or m.get('end_time', 0)
+                                end_ts = end_time_ms / 1000 if end_time_ms else 0
                                 end_time = datetime.fromtimestamp(
-                                    end_time_ms / 1000) if end_time_ms else None
-                                market_id = m.get(
-                                    'marketId') or m.get('market_id')
+                                    end_ts) if end_ts else None
                                 slug = m.get('slug', '') or m.get(
                                     'marketSlug', '')
                                 title = m.get('marketTitle', '') or m.get(
                                     'title', '') or m.get('market_title', '')
 
-                                if market_id:
-                                    markets.append({
-                                        'market_id': market_id,
-                                        'title': title,
-                                        'end_time': end_time,
-                                        'end_time_str': end_time.strftime('%m-%d %H:%M') if end_time else '-',
-                                        'is_categorical': m.get('isCategorical', False) or m.get('is_categorical', False),
-                                        'volume': float(m.get('volume', 0) or 0),
-                                        'slug': slug,
-                                        'url': f"{cls.MARKET_URL_PREFIX}{slug}" if slug else f"{cls.MARKET_URL_PREFIX}{market_id}",
-                                    })
+                                markets.append({
+                                    'market_id': market_id,
+                                    'title': title,
+                                    'title_lower': title.lower(),  # 搜索用
+                                    'title_short': title[:50] + '...' if len(title) > 50 else title,  # 列表显示用
+                                    'market_id_str': str(market_id),
+                                    'end_time': end_time,
+                                    'sort_key': end_ts or _NO_END_SORT_KEY,  # 排序用，无到期时间排最后
+                                    'end_time_str': end_time.strftime('%m-%d %H:%M') if end_time else '-',
+                                    'is_categorical': m.get('isCategorical', False) or m.get('is_categorical', False),
+                                    'volume': float(m.get('volume', 0) or 0),
+                                    'slug': slug,
+                                    'url': f"{cls.MARKET_URL_PREFIX}{slug}" if slug else f"{cls.MARKET_URL_PREFIX}{market_id}",
+                                })
                             if markets:
                                 break
                 except Exception:
@@ -1274,68 +1400,71 @@ class MarketListService:
             pass
 
         # 按到期时间排序
-        markets.sort(key=lambda x: x['end_time']
-                     if x['end_time'] else datetime.max)
+        markets.sort(key=itemgetter('sort_key'))
         return markets
 
     @classmethod
-    def get_cached_markets(cls) -> list:
+    def get_cached_markets(cls) -> tuple:
         """获取缓存的市场列表（线程安全）"""
-        with cls._lock:
-            return cls._markets_cache.copy()  # 返回副本避免外部修改
-
-    @classmethod
-    def get_market_by_id(cls, market_id: int) -> dict:
-        """根据ID获取单个市场信息（线程安全）
-
-        Args:
-            market_id: 市场ID
-
-        Returns:
-            市场信息字典，未找到返回 None
-        """
-        with cls._lock:
-            for m in cls._markets_cache:
-                if m['market_id'] == market_id:
-                    return m.copy()
-        return None
+        return cls._snapshot.markets  # 不可变快照，直接返回；需要修改时调用方自行 list()
 
     @classmethod
     def get_cache_age(cls) -> float:
         """获取缓存年龄（秒）"""
-        if cls._cache_time == 0:
+        cache_time = cls._snapshot.cache_time
+        if cache_time == 0:
             return float('inf')
-        return time.time() - cls._cache_time
+        return time.time() - cache_time
 
     @classmethod
-    def refresh_now(cls):
-        """立即刷新市场数据（同步）"""
-        cls._fetch_and_update()
+    def refresh_now(cls, wait: bool = False):
+        """立即刷新市场数据
+
+        后台刷新线程运行时默认只唤醒该线程并立即返回，此时数据还未更新；
+        需要拿到最新数据的调用方传 wait=True，在当前线程同步刷新。
+        没有后台线程时总是同步刷新。
+        """
+        if not wait and cls._refresh_thread and cls._refresh_thread.is_alive():
+            cls._refresh_event.set()
+        else:
+            cls._fetch_and_update()
 
     @classmethod
     def is_loaded(cls) -> bool:
         """是否已加载完成"""
         return cls._loaded
 
+    @classmethod
+    def wait_until_loaded(cls, timeout: float = None) -> bool:
+        """等待首次加载结束
+
+        Args:
+            timeout: 最长等待秒数，None 表示一直等待
+
+        Returns:
+            是否已加载完成
+        """
+        cls._initial_load_done.wait(timeout)
+        return cls._loaded
+
     @classmethod
     def is_loading(cls) -> bool:
         """是否正在加载"""
         return cls._loading
 
     @classmethod
-    def get_recent_markets(cls, max_count: int = 10) -> list:
+    def get_recent_markets(cls, max_count: int = 10) -> tuple:
         """获取最近到期的市场列表
         
         Args:
             max_count: 最多返回数量
             
         Returns:
-            市场列表，每个元素包含 market_id, title, end_time_str, is_categorical, child_markets, url
+            市场元组（只读），每个元素包含 market_id, title, end_time_str, is_categorical, child_markets, url
         """
-        with cls._lock:
-            if not cls._loaded:
-                return []
-            return cls._markets_cache[:max_count]
+        if not cls._loaded:
+            return ()
+        return cls._snapshot.markets[:max_count]
 
     @classmethod
     def get_child_markets(cls, market_id: int) -> list:
@@ -1348,11 +1477,8 @@ class MarketListService:
             子市场列表，每个元素包含 market_id, title
             如果不是分类市场或未缓存，返回空列表
         """
-        with cls._lock:
-            for m in cls._markets_cache:
-                if m['market_id'] == market_id:
-                    return m.get('child_markets', [])
-            return []
+        m = cls._snapshot.by_id.get(market_id)
+        return m.get('child_markets', []) if m else []
 
     @classmethod
     def get_market_by_id(cls, market_id: int) -> dict:
@@ -1364,11 +1490,7 @@ class MarketListService:
         Returns:
             市场信息字典，未找到返回空字典
         """
-        with cls._lock:
-            for m in cls._markets_cache:
-                if m['market_id'] == market_id:
-                    return m
-            return {}
+        return cls._snapshot.by_id.get(market_id, {})
 
     @classmethod
     def display_recent_markets(cls, max_count: int = 10):
@@ -1377,10 +1499,9 @@ class MarketListService:
         Args:
             max_count: 最多显示数量
         """
-        with cls._lock:
-            loaded = cls._loaded
-            loading = cls._loading
-            markets = cls._markets_cache[:max_count] if loaded else []
+        loaded = cls._loaded
+        loading = cls._loading
+        markets = cls._snapshot.markets[:max_count] if loaded else ()
 
         if not loaded:
             if loading:
@@ -1405,10 +1526,8 @@ class MarketListService:
         for m in markets:
             market_id = m['market_id']
             end_time = m['end_time_str']
-            title = m['title'][:50] + \
-                '...' if len(m['title']) > 50 else m['title']
             cat_mark = ' [分类]' if m['is_categorical'] else ''
-            print(f"  {market_id:<8} {end_time:<14} {title}{cat_mark}")
+            print(f"  {market_id:<8} {end_time:<14} {m['title_short']}{cat_mark}")
             print(f"           └─ {m['url']}")
 
         print(f"{'─'*80}")
@@ -1420,11 +1539,11 @@ class MarketListService:
         Args:
             max_count: 最多显示数量
         """
-        with cls._lock:
-            loaded = cls._loaded
-            loading = cls._loading
-            markets = cls._markets_cache[:max_count] if loaded else []
-            total_count = len(cls._markets_cache)
+        snapshot = cls._snapshot
+        loaded = cls._loaded
+        loading = cls._loading
+        markets = snapshot.markets[:max_count] if loaded else ()
+        total_count = len(snapshot.markets)
 
         if not loaded:
             if loading:
@@ -1437,34 +1556,38 @@ class MarketListService:
             print("\n暂无市场数据")
             return
 
-        print(f"\n{'='*80}")
-        print(f"{'活跃市场列表':^80}")
-        print(f"{'='*80}")
+        # 同一快照、同一数量的渲染结果直接复用 (快照刷新后 cache_time 变化自动失效)
+        key = (snapshot.cache_time, max_count)
+        text = cls._display_cache.get(key)
+        if text is None:
+            lines = [
+                f"\n{'='*80}",
+                f"{'活跃市场列表':^80}",
+                f"{'='*80}",
+            ]
 
-        for i, m in enumerate(markets, 1):
-            market_id = m['market_id']
-            end_time = m['end_time_str']
-            title = m['title']
-            url = m['url']
-            volume = m['volume']
-            cat_mark = '[分类市场]' if m['is_categorical'] else '[二元市场]'
+            for i, m in enumerate(markets, 1):
+                cat_mark = '[分类市场]' if m['is_categorical'] else '[二元市场]'
+                lines.append(f"\n{i}. {m['title']}")
+                lines.append(
+                    f"   ID: {m['market_id']}  |  到期: {m['end_time_str']}  |  交易量: ${m['volume']:,.0f}  |  {cat_mark}")
+                lines.append(f"   链接: {m['url']}")
 
-            print(f"\n{i}. {title}")
-            print(
-                f"   ID: {market_id}  |  到期: {end_time}  |  交易量: ${volume:,.0f}  |  {cat_mark}")
-            print(f"   链接: {url}")
+            lines.append(f"\n{'='*80}")
+            if total_count > max_count:
+                lines.append(f"(共 {total_count} 个市场，仅显示前 {max_count} 个)")
 
-        print(f"\n{'='*80}")
-        if total_count > max_count:
-            print(f"(共 {total_count} 个市场，仅显示前 {max_count} 个)")
+            text = '\n'.join(lines) + '\n'
+            cls._display_cache[key] = text
+
+        sys.stdout.write(text)
 
     @classmethod
     def search_markets(cls, keyword: str) -> list:
         """搜索市场（线程安全）"""
         keyword = keyword.lower()
-        with cls._lock:
-            return [m.copy() for m in cls._markets_cache
-                    if keyword in m['title'].lower() or keyword in str(m['market_id'])]
+        return [m for m in cls._snapshot.markets
+                if keyword in m['title_lower'] or keyword in m['market_id_str']]
 
     @classmethod
     def get_market_url(cls, market_id: int) -> str:
@@ -1473,15 +1596,3 @@ class MarketListService:
         if m:
             return m['url']
         return f"{cls.MARKET_URL_PREFIX}{market_id}"
-
-
-def handle_insufficient_balance(insufficient_list: list) -> tuple:
-    """处理余额不足的选择（便捷函数）
-
-    Args:
-        insufficient_list: [(remark, balance, required), ...]
-
-    Returns:
-        (action, skip_remarks)
-    """
-    return UserConfirmation.handle_insufficient_balance_choice(insufficient_list)
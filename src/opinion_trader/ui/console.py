@@ -2,12 +2,18 @@
 终端输出美化模块 - 基于 rich + questionary
 提供统一的 UI 交互接口
 """
+import sys
+from functools import lru_cache
+
 import questionary
 from questionary import Style, Choice, Separator
 from rich.console import Console
 from rich.table import Table
+from rich.box import ROUNDED
+from rich.json import JSON
 from rich.panel import Panel
 from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
+from rich.segment import Segments
 from rich.text import Text
 from rich import print as rprint
 
@@ -31,46 +37,101 @@ Q_STYLE = Style([
 
 # ============ 消息输出 ============
 
-def success(message: str):
-    """成功消息"""
-    console.print(f"[green]✓[/green] {message}")
+# 消息前缀 (预先构建好的 Text，消息本身按纯文本输出，不做 markup 解析；
+# 像 "[账户备注]" 这样的方括号内容也会原样显示)
+_OK = Text("✓ ", style="green")
+_ERR = Text("✗ ", style="red")
+_WARN = Text("! ", style="yellow")
+_INFO = Text("ℹ ", style="blue")
+
+
+def warning_text(message: str) -> Text:
+    """带警告前缀的 Text (需要和其他内容合并成一次输出时使用)"""
+    return Text.assemble(_WARN, message)
+
+
+def info_text(message: str) -> Text:
+    """带信息前缀的 Text (需要和其他内容合并成一次输出时使用)"""
+    return Text.assemble(_INFO, message)
+
+
+if console.is_terminal:
+    def success(message: str):
+        """成功消息"""
+        console.print(_OK, message, sep="", markup=False)
 
+    def error(message: str):
+        """错误消息"""
+        console.print(_ERR, message, sep="", markup=False)
 
-def error(message: str):
-    """错误消息"""
-    console.print(f"[red]✗[/red] {message}")
+    def warning(message: str):
+        """警告消息"""
+        console.print(_WARN, message, sep="", markup=False)
 
+    def info(message: str):
+        """信息消息"""
+        console.print(_INFO, message, sep="", markup=False)
 
-def warning(message: str):
-    """警告消息"""
-    console.print(f"[yellow]![/yellow] {message}")
+    def dim(message: str):
+        """灰色消息"""
+        console.print(message, style="dim", markup=False)
+else:
+    # stdout 不是终端 (守护进程日志、管道/文件重定向) 时，样式最终都会被去掉，
+    # 消息函数直接写纯文本，省掉 rich 的渲染和样式处理
+    def _plain(prefix: str, message) -> None:
+        sys.stdout.write(f"{prefix}{message}\n")
+        sys.stdout.flush()
 
+    def success(message: str):
+        """成功消息"""
+        _plain("✓ ", message)
 
-def info(message: str):
-    """信息消息"""
-    console.print(f"[blue]ℹ[/blue] {message}")
+    def error(message: str):
+        """错误消息"""
+        _plain("✗ ", message)
 
+    def warning(message: str):
+        """警告消息"""
+        _plain("! ", message)
 
-def dim(message: str):
-    """灰色消息"""
-    console.print(f"[dim]{message}[/dim]")
+    def info(message: str):
+        """信息消息"""
+        _plain("ℹ ", message)
+
+    def dim(message: str):
+        """灰色消息"""
+        _plain("", message)
 
 
 # ============ 标题和分节 ============
 
+@lru_cache(maxsize=64)
+def _panel(title: str, subtitle: str, style: str) -> Panel:
+    """标题面板 (header/banner 共用，同样的参数只构建一次)
+
+    标题和副标题预先解析成 Text，重复打印时不再做 markup 解析。
+    """
+    return Panel.fit(
+        console.render_str(f"[bold cyan]{title}[/bold cyan]"),
+        subtitle=console.render_str(subtitle) if subtitle else None,
+        border_style=style,
+    )
+
+
 def header(title: str, subtitle: str = None):
     """打印标题面板"""
-    content = f"[bold cyan]{title}[/bold cyan]"
-    if subtitle:
-        console.print(
-            Panel.fit(content, subtitle=subtitle, border_style="blue"))
-    else:
-        console.print(Panel.fit(content, border_style="blue"))
+    console.print(_panel(title, subtitle, "blue"))
+
+
+@lru_cache(maxsize=64)
+def _section_text(title: str) -> Text:
+    """分节标题的渲染结果 (标题集合固定且很小，解析一次后复用)"""
+    return console.render_str(f"\n[bold cyan]━━━ {title} ━━━[/bold cyan]")
 
 
 def section(title: str):
     """打印分节标题"""
-    console.print(f"\n[bold cyan]━━━ {title} ━━━[/bold cyan]")
+    console.print(_section_text(title))
 
 
 def divider(char: str = "─", style: str = "dim", width: int = 60):
@@ -135,7 +196,7 @@ def select(prompt: str, choices: list, back_option: bool = True, back_text: str
         q_choices.append(Separator("─" * 35))
         q_choices.append(Choice(f"↩️  {back_text}", value=None))
 
-    return questionary.select(
+    result = questionary.select(
         prompt,
         choices=q_choices,
         style=Q_STYLE,
@@ -143,6 +204,11 @@ def select(prompt: str, choices: list, back_option: bool = True, back_text: str
         use_arrow_keys=True,
     ).ask()
 
+    # 处理用户取消或中断的情况
+    if result is None or result == "":
+        return None
+    return result
+
 
 def select_multiple(prompt: str, choices: list, min_count: int = 0) -> list:
     """
@@ -283,8 +349,6 @@ def table(title: str = None, columns: list = None, rows: list = None,
         show_header: 是否显示表头
         box_style: 边框样式
     """
-    from rich.box import ROUNDED, SIMPLE, MINIMAL
-
     t = Table(
         title=title,
         show_header=show_header,
@@ -312,8 +376,6 @@ def table(title: str = None, columns: list = None, rows: list = None,
 
 def create_table(title: str = None, columns: list = None) -> Table:
     """创建表格对象（用于动态添加行）"""
-    from rich.box import ROUNDED
-
     t = Table(title=title, show_header=bool(columns),
               header_style="bold magenta", box=ROUNDED)
     if columns:
@@ -353,23 +415,25 @@ def progress_bar():
 
 def banner(text: str, subtitle: str = None, style: str = "blue"):
     """打印横幅"""
-    console.print(Panel.fit(
-        f"[bold cyan]{text}[/bold cyan]",
-        subtitle=subtitle,
-        border_style=style
-    ))
+    console.print(_panel(text, subtitle, style))
 
 
-def code(text: str, language: str = "python"):
-    """打印代码块"""
+@lru_cache(maxsize=128)
+def _syntax(language: str, text: str, width: int) -> Segments:
+    """代码高亮的渲染结果 (按语言、内容和终端宽度缓存，相同片段不再重复词法分析)"""
+    # rich.syntax 会加载 pygments，只在第一次打印代码时导入
     from rich.syntax import Syntax
     syntax = Syntax(text, language, theme="monokai", line_numbers=True)
-    console.print(syntax)
+    return Segments(list(console.render(syntax, console.options.update_width(width))))
+
+
+def code(text: str, language: str = "python"):
+    """打印代码块"""
+    console.print(_syntax(language, text, console.width))
 
 
 def json_print(data):
     """美化打印 JSON"""
-    from rich.json import JSON
     console.print(JSON.from_data(data))
 
 
@@ -383,3 +447,4 @@ def clear():
 # 直接使用 console.print 的别名
 print = console.print
 log = console.log
+
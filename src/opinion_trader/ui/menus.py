@@ -13,7 +13,7 @@ from opinion_trader.ui.console import (
 )
 
 
-@dataclass
+@dataclass(slots=True)
 class MenuItem:
     """菜单项"""
     label: str          # 显示文字
@@ -22,21 +22,29 @@ class MenuItem:
     handler: Callable = None  # 处理函数
     submenu: 'Menu' = None    # 子菜单
     enabled: bool = True      # 是否启用
+    _display: str = field(default="", init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # 图标和文字构造后不再变化，显示文字只拼接一次
+        self._display = f"{self.icon} {self.label}" if self.icon else self.label
     
     def display(self) -> str:
         """获取显示文字"""
-        if self.icon:
-            return f"{self.icon} {self.label}"
-        return self.label
+        return self._display
 
 
-@dataclass  
+@dataclass(slots=True)
 class Menu:
     """菜单基类"""
     title: str
     items: List[MenuItem] = field(default_factory=list)
     back_text: str = "返回"
     show_header: bool = True
+    _by_value: Dict[str, MenuItem] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self):
+        for item in self.items:
+            self._by_value.setdefault(item.value, item)
     
     def add_item(
         self,
@@ -47,13 +55,15 @@ class Menu:
         submenu: 'Menu' = None,
     ):
         """添加菜单项"""
-        self.items.append(MenuItem(
+        item = MenuItem(
             label=label,
             value=value,
             icon=icon,
             handler=handler,
             submenu=submenu,
-        ))
+        )
+        self.items.append(item)
+        self._by_value.setdefault(value, item)
     
     def add_separator(self):
         """添加分隔线"""
@@ -92,7 +102,7 @@ class Menu:
                 return None
             
             # 查找对应的菜单项
-            item = next((i for i in self.items if i.value == choice), None)
+            item = self._by_value.get(choice)
             
             if item:
                 if item.submenu:
@@ -117,6 +127,8 @@ class Menu:
 
 class MainMenu(Menu):
     """主菜单"""
+
+    __slots__ = ('trader', '_handlers')
     
     def __init__(self, trader=None):
         super().__init__(
@@ -124,7 +136,22 @@ class MainMenu(Menu):
             back_text="退出程序"
         )
         self.trader = trader
+        self._handlers = self._build_handlers()
         self._init_items()
+
+    def _build_handlers(self) -> Dict[str, Callable]:
+        """构建 选择值 -> 处理函数 映射"""
+        if not self.trader:
+            return {}
+        return {
+            'trade': self.trader.trading_menu,
+            'merge': self.trader.merge_split_menu,
+            'orders': self.trader.query_open_orders,
+            'cancel': self.trader.cancel_orders_menu,
+            'position': self.trader.query_positions,
+            'assets': self.trader.query_account_assets,
+            'claim': self.trader.claim_menu,
+        }
     
     def _init_items(self):
         """初始化菜单项"""
@@ -153,20 +180,7 @@ class MainMenu(Menu):
     
     def _handle_choice(self, choice: str):
         """处理选择"""
-        if not self.trader:
-            return
-        
-        handlers = {
-            'trade': self.trader.trading_menu,
-            'merge': self.trader.merge_split_menu,
-            'orders': self.trader.query_open_orders,
-            'cancel': self.trader.cancel_orders_menu,
-            'position': self.trader.query_positions,
-            'assets': self.trader.query_account_assets,
-            'claim': self.trader.claim_menu,
-        }
-        
-        handler = handlers.get(choice)
+        handler = self._handlers.get(choice)
         if handler:
             try:
                 handler()
@@ -176,6 +190,8 @@ class MainMenu(Menu):
 
 class TradingMenu(Menu):
     """交易模式菜单"""
+
+    __slots__ = ()
     
     def __init__(self):
         super().__init__(
@@ -205,6 +221,8 @@ class TradingMenu(Menu):
 
 class MergeSplitMenu(Menu):
     """合并/拆分菜单"""
+
+    __slots__ = ()
     
     def __init__(self):
         super().__init__(
@@ -221,6 +239,8 @@ class MergeSplitMenu(Menu):
 
 class CancelOrdersMenu(Menu):
     """撤单菜单"""
+
+    __slots__ = ()
     
     def __init__(self):
         super().__init__(
@@ -238,6 +258,8 @@ class CancelOrdersMenu(Menu):
 
 class QueryPositionMenu(Menu):
     """查询持仓菜单"""
+
+    __slots__ = ()
     
     def __init__(self):
         super().__init__(
@@ -254,6 +276,8 @@ class QueryPositionMenu(Menu):
 
 class ClaimMenu(Menu):
     """Claim菜单"""
+
+    __slots__ = ()
     
     def __init__(self):
         super().__init__(
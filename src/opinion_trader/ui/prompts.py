@@ -7,13 +7,57 @@
 - 金额/价格/份额输入
 - 确认对话框
 """
+import re
+from operator import attrgetter
 from typing import List, Optional, Tuple, Any, Callable
+
+from rich.console import Group
+from rich.text import Text
+
 from opinion_trader.ui.console import (
     console, select, select_multiple, confirm, 
     ask, ask_int, ask_float, 
-    success, error, warning, info, section, divider, kv
+    success, error, info, section, divider,
+    warning_text, info_text,
 )
 
+_INT_RE = re.compile(r'[+-]?\d+')  # 先校验格式，int() 不会再抛异常
+
+_get_remark = attrgetter('remark')
+_get_market_fields = attrgetter('market_id', 'market_title')
+
+
+def _account_remarks(configs: list) -> List[str]:
+    """批量取账户备注，缺少 remark 属性时回退为 账户N"""
+    try:
+        return list(map(_get_remark, configs))
+    except AttributeError:
+        pass
+    # 逐个回退：只有真正缺少 remark 的账户才生成默认名
+    remarks = []
+    for i, c in enumerate(configs, 1):
+        try:
+            remarks.append(c.remark)
+        except AttributeError:
+            remarks.append(f'账户{i}')
+    return remarks
+
+
+def _market_choices(markets: list, max_length: int, default_title: str) -> List[Tuple[str, Any]]:
+    """构建市场选项 [(显示文字, 市场对象), ...]，标题超长时截断"""
+    try:
+        fields = list(map(_get_market_fields, markets))
+    except AttributeError:
+        fields = [
+            (getattr(m, 'market_id', '?'), getattr(m, 'market_title', default_title))
+            for m in markets
+        ]
+    cut = max_length - 3
+    return [
+        (f"[{market_id}] {title if len(title) <= max_length else title[:cut] + '...'}", m)
+        for (market_id, title), m in zip(fields, markets)
+    ]
+
 
 # ============ 账户选择 ============
 
@@ -41,25 +85,13 @@ def select_accounts(
     
     section(title)
     
-    # 构建选项
-    choices = []
-    if allow_all:
-        choices.append({"name": "📋 全部账户", "value": "all", "checked": True})
-    
-    for idx, config in enumerate(configs):
-        remark = getattr(config, 'remark', f'账户{idx+1}')
-        choices.append({
-            "name": f"👤 {remark}",
-            "value": idx,
-            "checked": not allow_all  # 如果不允许全选，默认选中所有
-        })
+    remarks = _account_remarks(configs)
     
     if allow_all:
-        # 单选模式：选择"全部"或具体账户
-        result = select("请选择:", [
-            ("📋 全部账户", "all"),
-            *[(f"👤 {getattr(c, 'remark', f'账户{i+1}')}", i) for i, c in enumerate(configs)]
-        ], back_option=True, back_text="返回")
+        # 单选模式：选择"全部"或具体账户 (直接在同一个列表上追加，不建中间列表)
+        choices = [("📋 全部账户", "all")]
+        choices.extend((f"👤 {remark}", i) for i, remark in enumerate(remarks))
+        result = select("请选择:", choices, back_option=True, back_text="返回")
         
         if result is None:
             return []
@@ -68,7 +100,11 @@ def select_accounts(
         else:
             return [result]
     else:
-        # 多选模式
+        # 多选模式：默认选中所有
+        choices = [
+            {"name": f"👤 {remark}", "value": idx, "checked": True}
+            for idx, remark in enumerate(remarks)
+        ]
         selected = select_multiple("请选择账户:", choices, min_count=min_count)
         if not selected:
             return []
@@ -92,7 +128,7 @@ def select_single_account(configs: list, title: str = "选择账户") -> Optiona
     
     section(title)
     
-    choices = [(f"👤 {getattr(c, 'remark', f'账户{i+1}')}", i) for i, c in enumerate(configs)]
+    choices = [(f"👤 {remark}", i) for i, remark in enumerate(_account_remarks(configs))]
     
     return select("请选择账户:", choices, back_option=True)
 
@@ -110,15 +146,16 @@ def input_market_id(prompt: str = "请输入市场ID") -> Optional[int]:
     if not market_id_str:
         return None
     
-    try:
-        market_id = int(market_id_str)
-        if market_id <= 0:
-            error("市场ID必须大于0")
-            return None
-        return market_id
-    except ValueError:
+    market_id_str = market_id_str.strip()
+    if not _INT_RE.fullmatch(market_id_str):
         error("请输入有效的数字")
         return None
+    
+    market_id = int(market_id_str)
+    if market_id <= 0:
+        error("市场ID必须大于0")
+        return None
+    return market_id
 
 
 def select_market(
@@ -143,14 +180,7 @@ def select_market(
     
     section(title)
     
-    choices = []
-    for m in markets:
-        market_id = getattr(m, 'market_id', '?')
-        market_title = getattr(m, 'market_title', '未知市场')
-        # 截断过长的标题
-        if len(market_title) > 40:
-            market_title = market_title[:37] + "..."
-        choices.append((f"[{market_id}] {market_title}", m))
+    choices = _market_choices(markets, 40, '未知市场')
     
     return select("请选择:", choices, back_option=True)
 
@@ -175,13 +205,7 @@ def select_child_market(
     info(f"分类市场: {parent_title}")
     console.print(f"  找到 {len(child_markets)} 个子市场")
     
-    choices = []
-    for child in child_markets:
-        child_id = getattr(child, 'market_id', '?')
-        child_title = getattr(child, 'market_title', '未知')
-        if len(child_title) > 35:
-            child_title = child_title[:32] + "..."
-        choices.append((f"[{child_id}] {child_title}", child))
+    choices = _market_choices(child_markets, 35, '未知')
     
     return select("请选择子市场:", choices, back_option=True)
 
@@ -293,16 +317,18 @@ def confirm_action(
     Returns:
         True 确认，False 取消
     """
-    if danger:
-        warning(f"即将执行: {action}")
-    else:
-        info(f"即将执行: {action}")
+    # 标题、明细和空行合并为一次输出 (前缀与 warning/info 一致，内容按纯文本显示)
+    prefixed = warning_text if danger else info_text
+    lines = [prefixed(f"即将执行: {action}")]
     
     if details:
-        for key, value in details.items():
-            kv(key, value)
+        lines.extend(
+            Text.assemble("  ", (f"{key}:", "dim"), f" {value}")
+            for key, value in details.items()
+        )
     
-    console.print()
+    lines.append(Text(""))
+    console.print(Group(*lines), markup=False)
     return confirm("确认执行?", default=not danger)
 
 
@@ -320,8 +346,13 @@ def confirm_dangerous(
     Returns:
         True 确认，False 取消
     """
-    warning(f"危险操作: {action}")
-    console.print(f"  [red]请输入 '{confirm_word}' 确认[/red]")
+    console.print(
+        Group(
+            warning_text(f"危险操作: {action}"),
+            Text(f"  请输入 '{confirm_word}' 确认", style="red"),
+        ),
+        markup=False,
+    )
     
     user_input = ask("确认")
     return user_input.lower() == confirm_word.lower()
@@ -7,10 +7,63 @@
 - 挂单表格
 - 市场列表表格
 """
-from typing import List, Dict, Any, Optional
-from rich.table import Table
-from rich.box import ROUNDED, SIMPLE, MINIMAL
-from opinion_trader.ui.console import console, create_table, print_table
+from itertools import chain, islice, repeat
+from operator import attrgetter
+from typing import TYPE_CHECKING, List, Dict, Any, Optional, NamedTuple
+from opinion_trader.ui.console import console
+
+# rich 的表格/边框模块只在真正绘制表格时导入
+if TYPE_CHECKING:
+    from rich.table import Table
+
+# 方向/状态样式 (未列出的取值按原逻辑归为 NO / 卖 / 失败)
+_POSITION_SIDE_STYLE = {'YES': "[green]YES[/green]", 'NO': "[red]NO[/red]"}
+_ORDER_SIDE_STYLE = {'BUY': "[green]买[/green]", 'SELL': "[red]卖[/red]"}
+_TRADE_SIDE_STYLE = {'BUY': "[green]买入[/green]", 'SELL': "[red]卖出[/red]"}
+_STATUS_STYLE = {'成功': "[green]✓[/green]"}
+_STATUS_FAILED_STYLE = "[red]✗[/red]"
+
+
+# ============ 行数据 ============
+# 入参仍是字典列表；绘制前按字段统一取值一次 (缺失字段取默认值)，之后按属性访问
+
+class _PositionRow(NamedTuple):
+    market: str = '未知'
+    side: str = 'YES'
+    shares: Any = 0
+    cost: float = 0
+    current: float = 0
+    pnl: float = 0
+
+
+class _OrderRow(NamedTuple):
+    id: str = ''
+    market: str = '未知'
+    side: str = 'BUY'
+    price: float = 0
+    amount: Any = 0
+    value: float = 0
+
+
+class _MarketRow(NamedTuple):
+    id: Any = '?'
+    title: str = '未知'
+    end_time: str = '-'
+    is_categorical: bool = False
+
+
+class _TradeRow(NamedTuple):
+    account: str = '?'
+    side: str = 'BUY'
+    shares: Any = 0
+    price: float = 0
+    status: str = '成功'
+
+
+def _adapt_rows(row_type, items: List[Dict[str, Any]]) -> list:
+    """字典列表 -> 具名元组列表"""
+    fields = tuple(row_type._field_defaults.items())
+    return [row_type(*[item.get(name, default) for name, default in fields]) for item in items]
 
 
 def accounts_table(
@@ -27,6 +80,9 @@ def accounts_table(
         title: 标题
         show_balance: 是否显示余额
     """
+    from rich.table import Table
+    from rich.box import ROUNDED
+
     t = Table(title=title, show_header=True, header_style="bold cyan", box=ROUNDED)
     t.add_column("#", style="dim", width=4)
     t.add_column("备注", style="white")
@@ -34,18 +90,19 @@ def accounts_table(
     if show_balance:
         t.add_column("余额", justify="right", style="green")
     
+    short_address = _short_address
     for idx, acc in enumerate(accounts, 1):
         row = [
             str(idx),
             acc.get('remark', f'账户{idx}'),
-            _short_address(acc.get('address', '')),
+            short_address(acc.get('address', '')),
         ]
         if show_balance:
             balance = acc.get('balance', 0)
             row.append(f"${balance:.2f}")
         t.add_row(*row)
     
-    console.print(t)
+    _flush_table(t)
 
 
 def positions_table(
@@ -62,6 +119,9 @@ def positions_table(
         title: 标题
         show_pnl: 是否显示盈亏
     """
+    from rich.table import Table
+    from rich.box import ROUNDED
+
     t = Table(title=title, show_header=True, header_style="bold magenta", box=ROUNDED)
     t.add_column("市场", style="white", max_width=30)
     t.add_column("方向", justify="center", width=6)
@@ -71,26 +131,22 @@ def positions_table(
     if show_pnl:
         t.add_column("盈亏", justify="right")
     
-    for pos in positions:
-        side = pos.get('side', 'YES')
-        side_style = "[green]YES[/green]" if side == 'YES' else "[red]NO[/red]"
-        
-        row = [
-            _truncate(pos.get('market', '未知'), 30),
-            side_style,
-            str(pos.get('shares', 0)),
-            f"{pos.get('cost', 0):.1f}¢",
-            f"{pos.get('current', 0):.1f}¢",
-        ]
-        
-        if show_pnl:
-            pnl = pos.get('pnl', 0)
-            pnl_style = f"[green]+${pnl:.2f}[/green]" if pnl >= 0 else f"[red]-${abs(pnl):.2f}[/red]"
-            row.append(pnl_style)
-        
+    truncate, pnl_text = _truncate, _pnl_text
+    rows = [
+        (
+            truncate(pos.market, 30),
+            _POSITION_SIDE_STYLE.get(pos.side, _POSITION_SIDE_STYLE['NO']),
+            str(pos.shares),
+            f"{pos.cost:.1f}¢",
+            f"{pos.current:.1f}¢",
+            *((pnl_text(pos.pnl),) if show_pnl else ()),
+        )
+        for pos in _adapt_rows(_PositionRow, positions)
+    ]
+    for row in rows:
         t.add_row(*row)
     
-    console.print(t)
+    _flush_table(t)
 
 
 def orders_table(
@@ -105,6 +161,9 @@ def orders_table(
             [{"id": "xxx", "market": "xxx", "side": "BUY", "price": 95.0, "amount": 100}, ...]
         title: 标题
     """
+    from rich.table import Table
+    from rich.box import ROUNDED
+
     t = Table(title=title, show_header=True, header_style="bold yellow", box=ROUNDED)
     t.add_column("订单ID", style="dim", width=12)
     t.add_column("市场", style="white", max_width=25)
@@ -113,20 +172,22 @@ def orders_table(
     t.add_column("数量", justify="right", style="cyan")
     t.add_column("金额", justify="right", style="green")
     
-    for order in orders:
-        side = order.get('side', 'BUY')
-        side_style = "[green]买[/green]" if side == 'BUY' else "[red]卖[/red]"
-        
-        t.add_row(
-            _short_id(order.get('id', '')),
-            _truncate(order.get('market', '未知'), 25),
-            side_style,
-            f"{order.get('price', 0):.1f}¢",
-            str(order.get('amount', 0)),
-            f"${order.get('value', 0):.2f}",
+    truncate, short_id = _truncate, _short_id
+    rows = [
+        (
+            short_id(order.id),
+            truncate(order.market, 25),
+            _ORDER_SIDE_STYLE.get(order.side, _ORDER_SIDE_STYLE['SELL']),
+            f"{order.price:.1f}¢",
+            str(order.amount),
+            f"${order.value:.2f}",
         )
+        for order in _adapt_rows(_OrderRow, orders)
+    ]
+    for row in rows:
+        t.add_row(*row)
     
-    console.print(t)
+    _flush_table(t)
 
 
 def markets_table(
@@ -143,6 +204,9 @@ def markets_table(
         title: 标题
         show_link: 是否显示链接
     """
+    from rich.table import Table
+    from rich.box import ROUNDED
+
     t = Table(title=title, show_header=True, header_style="bold blue", box=ROUNDED)
     t.add_column("ID", style="cyan", width=8)
     t.add_column("到期时间", width=14)
@@ -150,26 +214,20 @@ def markets_table(
     if show_link:
         t.add_column("链接", style="dim")
     
-    for m in markets:
-        market_id = m.get('id', '?')
-        market_title = m.get('title', '未知')
-        is_categorical = m.get('is_categorical', False)
-        
-        if is_categorical:
-            market_title += " [dim][分类][/dim]"
-        
-        row = [
-            str(market_id),
-            m.get('end_time', '-'),
-            _truncate(market_title, 50),
-        ]
-        
-        if show_link:
-            row.append(f"https://opinion.trade/market/{market_id}")
-        
+    truncate = _truncate
+    rows = [
+        (
+            str(m.id),
+            m.end_time,
+            truncate(m.title + (" [dim][分类][/dim]" if m.is_categorical else ""), 50),
+            *((f"https://opinion.trade/market/{m.id}",) if show_link else ()),
+        )
+        for m in _adapt_rows(_MarketRow, markets)
+    ]
+    for row in rows:
         t.add_row(*row)
     
-    console.print(t)
+    _flush_table(t)
 
 
 def orderbook_table(
@@ -187,6 +245,9 @@ def orderbook_table(
         title: 标题
         levels: 显示档位数
     """
+    from rich.table import Table
+    from rich.box import SIMPLE
+
     t = Table(title=title, show_header=True, header_style="bold", box=SIMPLE)
     t.add_column("买价", justify="right", style="green")
     t.add_column("买量", justify="right", style="green")
@@ -194,13 +255,10 @@ def orderbook_table(
     t.add_column("卖价", justify="right", style="red")
     t.add_column("卖量", justify="right", style="red")
     
-    # 对齐买卖单
-    max_levels = max(len(bids), len(asks), levels)
+    # 对齐买卖单: 固定显示 levels 行，不足的档位补 "-"
+    padded = zip(chain(bids, repeat(None)), chain(asks, repeat(None)))
     
-    for i in range(min(max_levels, levels)):
-        bid = bids[i] if i < len(bids) else None
-        ask = asks[i] if i < len(asks) else None
-        
+    for bid, ask in islice(padded, levels):
         t.add_row(
             f"{bid['price']:.1f}¢" if bid else "-",
             str(bid['amount']) if bid else "-",
@@ -209,12 +267,13 @@ def orderbook_table(
             str(ask['amount']) if ask else "-",
         )
     
-    console.print(t)
+    _flush_table(t)
 
 
 def summary_table(
     data: Dict[str, Any],
     title: str = "汇总",
+    boxed: bool = False,
 ) -> None:
     """
     显示汇总表格（键值对形式）
@@ -222,7 +281,24 @@ def summary_table(
     Args:
         data: 数据字典 {"总资产": "$1000", "盈亏": "+$50", ...}
         title: 标题
+        boxed: 是否使用带边框的表格（默认直接输出对齐的键值行，省去表格测量排版）
     """
+    if not boxed:
+        from rich.cells import cell_len
+
+        keys = [str(key) for key in data]
+        width = max(map(cell_len, keys), default=0)
+        lines = [f"[italic]{title}[/italic]"]
+        lines.extend(
+            f"  [dim]{key}{' ' * (width - cell_len(key))}[/dim]  [bold]{value}[/bold]"
+            for key, value in zip(keys, data.values())
+        )
+        console.print("\n".join(lines), highlight=False)
+        return
+
+    from rich.table import Table
+    from rich.box import MINIMAL
+
     t = Table(title=title, show_header=False, box=MINIMAL)
     t.add_column("项目", style="dim")
     t.add_column("数值", style="bold")
@@ -230,7 +306,7 @@ def summary_table(
     for key, value in data.items():
         t.add_row(key, str(value))
     
-    console.print(t)
+    _flush_table(t)
 
 
 def trade_summary_table(
@@ -245,6 +321,9 @@ def trade_summary_table(
             [{"account": "xxx", "side": "BUY", "shares": 100, "price": 95.0, "status": "成功"}, ...]
         title: 标题
     """
+    from rich.table import Table
+    from rich.box import ROUNDED
+
     t = Table(title=title, show_header=True, header_style="bold", box=ROUNDED)
     t.add_column("账户", style="cyan")
     t.add_column("方向", justify="center", width=6)
@@ -253,30 +332,20 @@ def trade_summary_table(
     t.add_column("金额", justify="right", style="green")
     t.add_column("状态", justify="center")
     
-    total_amount = 0
-    total_shares = 0
+    # 每行字段只取一次，合计直接对取出的数值求和
+    rows = _adapt_rows(_TradeRow, trades)
+    amounts = [row.shares * row.price / 100 for row in rows]
+    total_shares = sum(map(attrgetter('shares'), rows))
+    total_amount = sum(amounts)
     
-    for trade in trades:
-        side = trade.get('side', 'BUY')
-        side_style = "[green]买入[/green]" if side == 'BUY' else "[red]卖出[/red]"
-        
-        status = trade.get('status', '成功')
-        status_style = "[green]✓[/green]" if status == '成功' else "[red]✗[/red]"
-        
-        shares = trade.get('shares', 0)
-        price = trade.get('price', 0)
-        amount = shares * price / 100
-        
-        total_shares += shares
-        total_amount += amount
-        
+    for (account, side, shares, price, status), amount in zip(rows, amounts):
         t.add_row(
-            trade.get('account', '?'),
-            side_style,
+            account,
+            _TRADE_SIDE_STYLE.get(side, _TRADE_SIDE_STYLE['SELL']),
             str(shares),
             f"{price:.1f}¢",
             f"${amount:.2f}",
-            status_style,
+            _STATUS_STYLE.get(status, _STATUS_FAILED_STYLE),
         )
     
     # 添加汇总行
@@ -289,33 +358,38 @@ def trade_summary_table(
         "",
     )
     
-    console.print(t)
+    _flush_table(t)
 
 
 # ============ 辅助函数 ============
 
+def _flush_table(t: "Table") -> None:
+    """渲染整张表格后一次性写出并刷新"""
+    with console.capture() as capture:
+        console.print(t)
+    console.file.write(capture.get())
+    console.file.flush()
+
+
+def _pnl_text(pnl: float) -> str:
+    """格式化盈亏（带颜色）"""
+    text = f"{pnl:+.2f}"  # 符号由格式化给出，"$" 插在符号之后
+    color = "red" if pnl < 0 else "green"
+    return f"[{color}]{text[0]}${text[1:]}[/{color}]"
+
+
 def _short_address(address: str, length: int = 10) -> str:
     """缩短地址显示"""
     if not address:
         return "-"
-    if len(address) <= length * 2:
-        return address
-    return f"{address[:length]}...{address[-length:]}"
+    return f"{address[:length]}...{address[-length:]}" if len(address) > length * 2 else address
 
 
 def _short_id(order_id: str, length: int = 8) -> str:
     """缩短ID显示"""
-    if not order_id:
-        return "-"
-    if len(order_id) <= length:
-        return order_id
-    return f"{order_id[:length]}..."
+    return f"{order_id[:length]}..." if len(order_id or "") > length else (order_id or "-")
 
 
 def _truncate(text: str, max_length: int) -> str:
     """截断文本"""
-    if not text:
-        return "-"
-    if len(text) <= max_length:
-        return text
-    return text[:max_length - 3] + "..."
+    return text[:max_length - 3] + "..." if len(text or "") > max_length else (text or "-")
@@ -1,57 +1,59 @@
 """
 工具模块
+
+对外名称按需导入 (PEP 562)：首次访问时才加载对应子模块并缓存到本模块，
+因此 `from opinion_trader.utils.daemon import ...` 这类导入不会连带加载 rich/questionary。
 """
-from opinion_trader.utils.daemon import DaemonProcess
-from opinion_trader.utils.confirmation import UserConfirmation, handle_insufficient_balance
-from opinion_trader.utils.helpers import translate_error, format_price
-from opinion_trader.utils.console import (
-    # 核心对象
-    console,
-    # 消息输出
-    success, error, warning, info, dim,
-    # 标题布局
-    header, section, divider, rule, banner, clear,
-    # 键值
-    kv, bullet,
-    # 交互式菜单 (questionary)
-    select, select_multiple, confirm, pause,
-    # 输入
-    ask, ask_int, ask_float, ask_password,
-    # 表格
-    table, create_table, print_table,
-    # 进度
-    spinner, progress_bar,
-    # 特殊
-    code, json_print,
-    # 打印
-    print, log,
-)
-
-__all__ = [
+import importlib
+
+_DAEMON = "opinion_trader.utils.daemon"
+_CONFIRMATION = "opinion_trader.utils.confirmation"
+_HELPERS = "opinion_trader.utils.helpers"
+_CONSOLE = "opinion_trader.utils.console"
+
+# 名称 -> 所在子模块
+_LAZY = {
     # 旧模块
-    "DaemonProcess",
-    "UserConfirmation",
-    "handle_insufficient_balance",
-    "translate_error",
-    "format_price",
-    # console 核心
-    "console",
-    # 消息
-    "success", "error", "warning", "info", "dim",
-    # 布局
-    "header", "section", "divider", "rule", "banner", "clear",
-    # 键值
-    "kv", "bullet",
-    # 交互
-    "select", "select_multiple", "confirm", "pause",
-    # 输入
-    "ask", "ask_int", "ask_float", "ask_password",
-    # 表格
-    "table", "create_table", "print_table",
-    # 进度
-    "spinner", "progress_bar",
-    # 特殊
-    "code", "json_print",
-    # 打印
-    "print", "log",
-]
+    "DaemonProcess": _DAEMON,
+    "UserConfirmation": _CONFIRMATION,
+    "handle_insufficient_balance": _CONFIRMATION,
+    "translate_error": _HELPERS,
+    "format_price": _HELPERS,
+    **dict.fromkeys((
+        # console 核心
+        "console",
+        # 消息
+        "success", "error", "warning", "info", "dim",
+        # 布局
+        "header", "section", "divider", "rule", "banner", "clear",
+        # 键值
+        "kv", "bullet",
+        # 交互
+        "select", "select_multiple", "confirm", "pause",
+        # 输入
+        "ask", "ask_int", "ask_float", "ask_password",
+        # 表格
+        "table", "create_table", "print_table",
+        # 进度
+        "spinner", "progress_bar",
+        # 特殊
+        "code", "json_print",
+        # 打印
+        "print", "log",
+    ), _CONSOLE),
+}
+
+__all__ = tuple(_LAZY)
+
+
+def __getattr__(name: str):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value  # 缓存，之后的访问不再经过 __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,8 +1,22 @@
 """
 用户确认交互模块 - 统一处理用户输入确认
 """
+import sys
 from typing import List, Tuple, Optional, Set, Union
 
+# yes_no 视为确认的输入 (已转小写)
+_YES_ANSWERS = frozenset(('y', 'yes', '是'))
+
+
+def _retry_input(prompt: str) -> str:
+    """重新输入时使用：直接写提示并读取一行，不经过 input() 的 readline 处理"""
+    sys.stdout.write(prompt)
+    sys.stdout.flush()
+    line = sys.stdin.readline()
+    if not line:
+        raise EOFError
+    return line.rstrip('\n')
+
 
 class UserConfirmation:
     """用户确认交互模块 - 统一处理用户输入确认"""
@@ -22,7 +36,7 @@ class UserConfirmation:
         response = input(f"{prompt} {suffix}: ").strip().lower()
         if not response:
             return default
-        return response in ('y', 'yes', '是')
+        return response in _YES_ANSWERS
 
     @staticmethod
     def confirm_keyword(prompt: str, keyword: str = 'yes') -> bool:
@@ -65,29 +79,27 @@ class UserConfirmation:
         Returns:
             int: 选择的索引 (1-based), 0表示取消
         """
-        print(f"\n{title}")
+        lines = [f"\n{title}"]
         for i, opt in enumerate(options, 1):
             if isinstance(opt, tuple):
                 label, desc = opt
-                print(f"  [{i}] {label} - {desc}")
+                lines.append(f"  [{i}] {label} - {desc}")
             else:
-                print(f"  [{i}] {opt}")
+                lines.append(f"  [{i}] {opt}")
+        print('\n'.join(lines))
 
         cancel_hint = " (留空返回)" if allow_cancel else ""
+        # 合法输入预先建表，直接按字符串查找
+        valid = {str(i): i for i in range(1, len(options) + 1)}
+        if allow_cancel:
+            valid[''] = 0
+        read = input  # 首次提示保留 input() (行编辑/历史)，重试改用 _retry_input
         while True:
-            choice = input(f"\n请选择{cancel_hint}: ").strip()
-            if not choice:
-                if allow_cancel:
-                    return 0
-                print("  请输入有效选项")
-                continue
-            try:
-                idx = int(choice)
-                if 1 <= idx <= len(options):
-                    return idx
-            except ValueError:
-                pass
-            print("  无效输入，请重新选择")
+            choice = read(f"\n请选择{cancel_hint}: ").strip()
+            if choice in valid:
+                return valid[choice]
+            print("  无效输入，请重新选择" if choice else "  请输入有效选项")
+            read = _retry_input
 
     @staticmethod
     def confirm_with_summary(title: str, items: List[Tuple[str, str]], keyword: str = 'done') -> bool:
@@ -120,35 +132,20 @@ class UserConfirmation:
             action: 'continue'/'skip'/'cancel'
             skip_remarks: 需跳过的账户备注集合
         """
-        if not insufficient_list:
-            return ('continue', None)
+        return handle_insufficient_balance(insufficient_list)
 
-        print(f"\n[!] 余额不足警告:")
-        for item in insufficient_list:
-            if len(item) == 3:
-                remark, balance, required = item
-            else:
-                _, remark, balance, required = item
-            print(f"   [{remark}] 余额${balance:.2f} < 需要${required:.2f}")
-
-        options = [
-            ("继续", "忽略警告继续执行"),
-            ("跳过", "跳过余额不足的账户"),
-            ("停止", "取消操作")
-        ]
-        choice = UserConfirmation.select_option(
-            "请选择操作", options, allow_cancel=False)
-
-        if choice == 1:
-            return ('continue', None)
-        elif choice == 2:
-            skip_remarks = set()
-            for item in insufficient_list:
-                remark = item[0] if len(item) == 3 else item[1]
-                skip_remarks.add(remark)
-            return ('skip', skip_remarks)
-        else:
-            return ('cancel', None)
+
+def _normalize_insufficient(items: list) -> List[Tuple[str, float, float]]:
+    """统一为 (remark, balance, required)，兼容带 idx 的四元组 (后三项位置固定)"""
+    return [tuple(item[-3:]) for item in items if len(item) in (3, 4)]
+
+
+_INSUFFICIENT_BALANCE_MENU = (
+    "\n请选择操作:\n"
+    "  [1] 继续 - 忽略警告继续执行\n"
+    "  [2] 跳过 - 跳过余额不足的账户，仅使用余额充足的账户\n"
+    "  [3] 停止 - 取消操作"
+)
 
 
 def handle_insufficient_balance(insufficient_accounts: list) -> Tuple[str, Optional[Set[str]]]:
@@ -165,35 +162,26 @@ def handle_insufficient_balance(insufficient_accounts: list) -> Tuple[str, Optio
     if not insufficient_accounts:
         return ('continue', None)
 
-    print(f"\n[!] 余额不足警告:")
-    for item in insufficient_accounts:
-        if len(item) == 3:
-            remark, balance, required = item
-            print(f"   [{remark}] 余额${balance:.2f} < 需要${required:.2f}")
-        elif len(item) == 4:
-            _, remark, balance, required = item
-            print(f"   [{remark}] 余额${balance:.2f} < 需要${required:.2f}")
+    normalized = _normalize_insufficient(insufficient_accounts)
+    skip_remarks = {remark for remark, _, _ in normalized}
 
-    print(f"\n请选择操作:")
-    print(f"  [1] 继续 - 忽略警告继续执行")
-    print(f"  [2] 跳过 - 跳过余额不足的账户，仅使用余额充足的账户")
-    print(f"  [3] 停止 - 取消操作")
+    lines = ["\n[!] 余额不足警告:"]
+    lines.extend(f"   [{remark}] 余额${balance:.2f} < 需要${required:.2f}"
+                 for remark, balance, required in normalized)
+    lines.append(_INSUFFICIENT_BALANCE_MENU)
+    # 一次写出并立即刷新，避免提示在 input() 之前被缓冲
+    sys.stdout.write('\n'.join(lines) + '\n')
+    sys.stdout.flush()
 
+    read = input  # 首次提示保留 input() (行编辑/历史)，重试改用 _retry_input
     while True:
-        choice = input("\n请选择 (1/2/3): ").strip()
+        choice = read("\n请选择 (1/2/3): ").strip()
         if choice == '1':
             return ('continue', None)
         elif choice == '2':
-            # 获取需要跳过的账户备注列表
-            skip_remarks = set()
-            for item in insufficient_accounts:
-                if len(item) == 3:
-                    remark, _, _ = item
-                elif len(item) == 4:
-                    _, remark, _, _ = item
-                skip_remarks.add(remark)
             return ('skip', skip_remarks)
         elif choice == '3':
             return ('cancel', None)
         else:
             print("  无效输入，请输入 1、2 或 3")
+            read = _retry_input
@@ -4,10 +4,63 @@
 import os
 import sys
 import time
+import select
 import signal
 import atexit
 from datetime import datetime
-from typing import Tuple, Optional
+from typing import List, Tuple, Optional
+
+
+def open_pidfd(pid: int) -> Optional[int]:
+    """打开进程的 pidfd (Linux 5.3+)，不支持或进程已不存在时返回 None"""
+    if not hasattr(os, 'pidfd_open'):
+        return None
+    try:
+        return os.pidfd_open(pid)
+    except OSError:
+        return None
+
+
+def send_signal(pid: int, pidfd: Optional[int], sig: int):
+    """发送信号；有 pidfd 时经由 pidfd 发送，不会误伤复用了同一 PID 的新进程"""
+    if pidfd is not None:
+        signal.pidfd_send_signal(pidfd, sig)
+    else:
+        os.kill(pid, sig)
+
+
+def wait_for_exit(pid: int, pidfd: Optional[int], timeout: float) -> bool:
+    """等待进程退出，在超时前退出返回 True"""
+    if pidfd is not None:
+        # 进程退出时 pidfd 变为可读，一次阻塞等待即可
+        readable, _, _ = select.select([pidfd], [], [], timeout)
+        return bool(readable)
+
+    # 无 pidfd: 从 10ms 起指数退避轮询 (单次最长 100ms)
+    deadline = time.monotonic() + timeout
+    delay = 0.01
+    while time.monotonic() < deadline:
+        time.sleep(delay)
+        delay = min(delay * 2, 0.1)
+        try:
+            os.kill(pid, 0)
+        except OSError:
+            return True
+    return False
+
+
+def tail_lines(path: str, n: int = 10, block: int = 8192) -> List[str]:
+    """读取文件最后 n 行 (从文件末尾按块向前读，不加载整个文件)"""
+    with open(path, 'rb') as f:
+        size = f.seek(0, os.SEEK_END)
+        while True:
+            start = max(0, size - block)
+            f.seek(start)
+            lines = f.read().splitlines()
+            # 块内第一行可能不完整，需多读到一行 (已读到文件头则无需)
+            if len(lines) > n or start == 0:
+                return [line.decode('utf-8', errors='replace') for line in lines[-n:]]
+            block *= 2
 
 
 class DaemonProcess:
@@ -15,6 +68,7 @@ class DaemonProcess:
 
     PID_FILE = "/tmp/opinion_trade.pid"
     LOG_FILE = "opinion_trade.log"
+    LOG_FILE_ABS = os.path.abspath(LOG_FILE)  # 状态输出用，类加载时解析一次
 
     @classmethod
     def is_running(cls) -> Tuple[bool, Optional[int]]:
@@ -38,47 +92,95 @@ class DaemonProcess:
 
     @classmethod
     def _remove_pid_file(cls):
-        """删除PID文件"""
-        try:
-            if os.path.exists(cls.PID_FILE):
-                os.remove(cls.PID_FILE)
-        except Exception:
-            pass
+        """删除PID文件及其锁文件"""
+        for path in (cls.PID_FILE, cls.PID_FILE + ".lock"):
+            try:
+                if os.path.exists(path):
+                    os.remove(path)
+            except Exception:
+                pass
 
     @classmethod
     def _write_pid_file(cls):
-        """写入PID文件"""
-        with open(cls.PID_FILE, 'w') as f:
-            f.write(str(os.getpid()))
+        """写入PID文件
+
+        认领过程持有独立锁文件上的 flock，两个守护进程同时启动时串行执行；
+        PID 先写入临时文件再 rename 到位，PID文件不会出现空内容的中间状态。
+        """
+        import fcntl  # 仅 POSIX，只在 daemonize 路径上导入
+
+        lock_file = cls.PID_FILE + ".lock"
+        while True:
+            lock_fd = os.open(lock_file, os.O_WRONLY | os.O_CREAT | os.O_CLOEXEC, 0o644)
+            fcntl.flock(lock_fd, fcntl.LOCK_EX)
+            # 锁文件可能在等待期间被 _remove_pid_file 删除，确认锁住的仍是路径上的那个文件
+            try:
+                if os.fstat(lock_fd).st_ino == os.stat(lock_file).st_ino:
+                    break
+            except FileNotFoundError:
+                pass
+            os.close(lock_fd)
+
+        try:
+            # 读取已有的PID文件 (内容无效时不删除，交给用户确认)
+            try:
+                with open(cls.PID_FILE, 'r') as f:
+                    pid = int(f.read().strip())
+            except FileNotFoundError:
+                pid = None
+            except (OSError, ValueError):
+                print(f"✗ PID文件 {cls.PID_FILE} 内容无效，确认没有守护进程在运行后请手动删除")
+                sys.exit(1)
+
+            if pid is not None and pid != os.getpid():
+                try:
+                    os.kill(pid, 0)
+                    alive = True
+                except ProcessLookupError:
+                    alive = False
+                except PermissionError:
+                    alive = True  # 进程存在，只是属于其他用户
+                if alive:
+                    print(f"✗ 已有守护进程在运行 (PID: {pid})")
+                    sys.exit(1)
+
+            tmp_file = f"{cls.PID_FILE}.{os.getpid()}.tmp"
+            with open(tmp_file, 'w') as f:
+                f.write(str(os.getpid()))
+            os.replace(tmp_file, cls.PID_FILE)
+        except OSError as e:
+            print(f"✗ 写入PID文件失败: {e}")
+            sys.exit(1)
+        finally:
+            os.close(lock_fd)
 
     @classmethod
     def stop_daemon(cls) -> bool:
         """停止守护进程"""
         running, pid = cls.is_running()
-        if not running:
+        if not running or pid is None:
             print("没有运行中的守护进程")
             return False
 
+        pidfd = open_pidfd(pid)
         try:
             print(f"正在停止守护进程 (PID: {pid})...")
-            os.kill(pid, signal.SIGTERM)
-            # 等待进程结束
-            for _ in range(10):
-                time.sleep(0.5)
-                try:
-                    os.kill(pid, 0)
-                except OSError:
-                    print("✓ 守护进程已停止")
-                    cls._remove_pid_file()
-                    return True
-            # 强制杀死
-            os.kill(pid, signal.SIGKILL)
-            print("✓ 守护进程已强制停止")
+            send_signal(pid, pidfd, signal.SIGTERM)
+            # 等待进程结束，最多 5 秒
+            if wait_for_exit(pid, pidfd, 5.0):
+                print("✓ 守护进程已停止")
+            else:
+                # 强制杀死
+                send_signal(pid, pidfd, signal.SIGKILL)
+                print("✓ 守护进程已强制停止")
             cls._remove_pid_file()
             return True
         except Exception as e:
             print(f"✗ 停止失败: {e}")
             return False
+        finally:
+            if pidfd is not None:
+                os.close(pidfd)
 
     @classmethod
     def status(cls):
@@ -86,15 +188,13 @@ class DaemonProcess:
         running, pid = cls.is_running()
         if running:
             print(f"✓ 守护进程运行中 (PID: {pid})")
-            print(f"  日志文件: {os.path.abspath(cls.LOG_FILE)}")
+            print(f"  日志文件: {cls.LOG_FILE_ABS}")
             # 显示最后几行日志
             if os.path.exists(cls.LOG_FILE):
                 print("\n  最近日志:")
                 try:
-                    with open(cls.LOG_FILE, 'r') as f:
-                        lines = f.readlines()
-                        for line in lines[-10:]:
-                            print(f"  {line.rstrip()}")
+                    for line in tail_lines(cls.LOG_FILE, 10):
+                        print(f"  {line.rstrip()}")
                 except Exception:
                     pass
         else:
@@ -116,7 +216,7 @@ class DaemonProcess:
             if pid > 0:
                 # 父进程退出
                 print(f"✓ 守护进程已启动")
-                print(f"  日志文件: {os.path.abspath(cls.LOG_FILE)}")
+                print(f"  日志文件: {cls.LOG_FILE_ABS}")
                 print(f"  查看状态: python trade.py status")
                 print(f"  停止进程: python trade.py stop")
                 sys.exit(0)
@@ -139,15 +239,17 @@ class DaemonProcess:
         sys.stdout.flush()
         sys.stderr.flush()
 
-        # 打开日志文件和/dev/null
+        # 打开日志文件和/dev/null (直接使用系统级 fd，dup2 后即关闭原 fd)
         try:
-            dev_null = open('/dev/null', 'r+')
-            log_file = open(cls.LOG_FILE, 'a', buffering=1)
+            dev_null = os.open(os.devnull, os.O_RDWR | os.O_CLOEXEC)
+            log_fd = os.open(cls.LOG_FILE, os.O_WRONLY | os.O_CREAT | os.O_APPEND | os.O_CLOEXEC, 0o644)
 
             # 重定向
-            os.dup2(dev_null.fileno(), 0)  # stdin
-            os.dup2(log_file.fileno(), 1)  # stdout
-            os.dup2(log_file.fileno(), 2)  # stderr
+            os.dup2(dev_null, 0)  # stdin
+            os.dup2(log_fd, 1)  # stdout
+            os.dup2(log_fd, 2)  # stderr
+            os.close(dev_null)
+            os.close(log_fd)
         except Exception:
             # 如果重定向失败，尝试继续运行
             pass
@@ -159,9 +261,24 @@ class DaemonProcess:
         atexit.register(cls._remove_pid_file)
 
         # 处理终止信号
-        def signal_handler(signum, frame):
-            print(f"\n[{datetime.now().strftime('%H:%M:%S')}] 收到终止信号，正在退出...")
-            sys.exit(0)
+        signal.signal(signal.SIGTERM, _term_handler)
+        signal.signal(signal.SIGINT, _term_handler)
+
 
-        signal.signal(signal.SIGTERM, signal_handler)
-        signal.signal(signal.SIGINT, signal_handler)
+def _term_handler(signum, frame):
+    """守护进程的终止信号处理
+
+    不抛 SystemExit (信号可能打断正在进行的 IO，完整的解释器清理有卡住的风险)：
+    尽力刷新缓冲后直接写 fd 1，删除PID文件，再 os._exit 退出。
+    """
+    for stream in (sys.stdout, sys.stderr):
+        try:
+            stream.flush()
+        except Exception:
+            pass
+    try:
+        os.write(1, f"\n[{datetime.now().strftime('%H:%M:%S')}] 收到终止信号，正在退出...\n".encode())
+    except OSError:
+        pass
+    DaemonProcess._remove_pid_file()
+    os._exit(0)
@@ -3,49 +3,76 @@
 """
 import re
 
+_MIN_VALUE_RE = re.compile(
+    r'Order value ([\d.]+) USDT is below the minimum required value of ([\d.]+) USDT')
+
+# translate_error 用到的全部关键词，一次扫描取出出现过的集合
+_ERROR_KEYWORD_RE = re.compile(
+    r'order not found|insufficient|balance|region|country|restricted'
+    r'|market|closed|resolved|price|invalid|range'
+    r'|quantity|shares|minimum|maximum|timeout|connection')
+
+# 常见的错误码，整串命中时直接查表
+_KNOWN_ERRORS = {
+    "ETIMEDOUT": "网络超时",
+    "ECONNRESET": "网络超时",
+    "ECONNREFUSED": "网络超时",
+}
+
+# 短于此长度的消息不可能命中任何关键词规则 (最短的 "region" 为 6 个字符)
+_MIN_KEYWORD_LEN = 6
+
 
 def translate_error(errmsg: str) -> str:
     """翻译常见错误信息"""
     if not errmsg:
         return "未知错误"
 
+    known = _KNOWN_ERRORS.get(errmsg)
+    if known is not None:
+        return known
+    if len(errmsg) < _MIN_KEYWORD_LEN:
+        return errmsg
+
     # 最低金额错误
-    min_value_match = re.search(
-        r'Order value ([\d.]+) USDT is below the minimum required value of ([\d.]+) USDT', errmsg)
+    min_value_match = _MIN_VALUE_RE.search(errmsg)
     if min_value_match:
         actual = min_value_match.group(1)
         required = min_value_match.group(2)
         return f"金额${actual}低于最低要求${required}"
 
+    # 单次扫描得到关键词集合，下面按原优先级判断 (与关键词出现顺序无关)
+    found = set(_ERROR_KEYWORD_RE.findall(errmsg.lower()))
+
     # 余额不足
-    if 'insufficient' in errmsg.lower() or 'balance' in errmsg.lower():
+    if 'insufficient' in found or 'balance' in found:
         return "余额不足"
 
     # 地区限制
-    if 'region' in errmsg.lower() or 'country' in errmsg.lower() or 'restricted' in errmsg.lower():
+    if 'region' in found or 'country' in found or 'restricted' in found:
         return "地区限制"
 
     # 订单不存在
-    if 'order not found' in errmsg.lower():
+    if 'order not found' in found:
         return "订单不存在"
 
     # 市场已关闭
-    if 'market' in errmsg.lower() and ('closed' in errmsg.lower() or 'resolved' in errmsg.lower()):
+    if 'market' in found and ('closed' in found or 'resolved' in found):
         return "市场已关闭"
 
     # 价格超出范围
-    if 'price' in errmsg.lower() and ('invalid' in errmsg.lower() or 'range' in errmsg.lower()):
+    if 'price' in found and ('invalid' in found or 'range' in found):
         return "价格无效"
 
     # 数量错误
-    if 'quantity' in errmsg.lower() or 'shares' in errmsg.lower():
-        if 'minimum' in errmsg.lower():
+    if 'quantity' in found or 'shares' in found:
+        if 'minimum' in found:
             return "数量低于最小要求"
-        elif 'maximum' in errmsg.lower():
+        elif 'maximum' in found:
             return "数量超过最大限制"
 
     # 网络错误
-    if 'timeout' in errmsg.lower() or 'connection' in errmsg.lower():
+    if 'timeout' in found or 'connection' in found:
         return "网络超时"
 
     # 如果没有匹配，返回原始消息（但截断过长的消息）
@@ -56,22 +83,25 @@ def translate_error(errmsg: str) -> str:
 
 def format_price(price: float) -> str:
     """格式化价格显示（*100并去掉小数点后多余的0）"""
-    # 先四舍五入到0.1分精度，避免浮点数精度问题
-    price_cent = round(price * 100, 1)
-    if price_cent == int(price_cent):
-        return f"{int(price_cent)}"
-    else:
-        return f"{price_cent:.1f}"
+    # 先四舍五入到0.1分精度，避免浮点数精度问题；再转成整数的 0.1 分单位
+    tenths = round(round(price * 100, 1) * 10)
+    whole, frac = divmod(abs(tenths), 10)
+    sign = "-" if tenths < 0 else ""
+    if frac:
+        return f"{sign}{whole}.{frac}"
+    return f"{sign}{whole}"
+
+
+# 金额缩写单位 (从大到小)
+_AMOUNT_SCALES = ((1000000, "M"), (1000, "K"))
 
 
 def format_amount(amount: float, currency: str = "$") -> str:
     """格式化金额显示"""
-    if amount >= 1000000:
-        return f"{currency}{amount/1000000:.2f}M"
-    elif amount >= 1000:
-        return f"{currency}{amount/1000:.2f}K"
-    else:
-        return f"{currency}{amount:.2f}"
+    for scale, suffix in _AMOUNT_SCALES:
+        if amount >= scale:
+            return f"{currency}{amount / scale:.2f}{suffix}"
+    return f"{currency}{amount:.2f}"
 
 
 def truncate_string(s: str, max_length: int = 20, suffix: str = "...") -> str:
@@ -85,7 +115,7 @@ def mask_address(address: str, prefix_len: int = 6, suffix_len: int = 4) -> str:
     """隐藏地址中间部分"""
     if len(address) <= prefix_len + suffix_len:
         return address
-    return f"{address[:prefix_len]}...{address[-suffix_len:]}"
+    return "".join((address[:prefix_len], "...", address[-suffix_len:]))
 
 
 def mask_private_key(key: str) -> str:
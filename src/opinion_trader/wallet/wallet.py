@@ -1,51 +1,62 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
 from bip_utils import (
+    Bip32Secp256k1,
     Bip39SeedGenerator,
-    Bip44,
-    Bip44Coins,
-    Bip44Changes
+    EthAddrEncoder
 )
 
 INPUT_FILE = "wallet.txt"
 OUTPUT_FILE = "evm_result.txt"
 
+# EVM 使用 BIP44 ETH 路径
+ETH_PATH = "m/44'/60'/0'/0/0"
+
 def mnemonic_to_evm(mnemonic: str):
     # 生成种子
     seed_bytes = Bip39SeedGenerator(mnemonic).Generate()
 
-    # EVM 使用 BIP44 ETH 路径: m/44'/60'/0'/0/0
-    bip44_ctx = Bip44.FromSeed(seed_bytes, Bip44Coins.ETHEREUM)
-    account = (
-        bip44_ctx
-        .Purpose()
-        .Coin()
-        .Account(0)
-        .Change(Bip44Changes.CHAIN_EXT)
-        .AddressIndex(0)
-    )
+    # 按路径直接派生到地址节点，不经过 Bip44 的逐级包装对象
+    node = Bip32Secp256k1.FromSeedAndPath(seed_bytes, ETH_PATH)
 
-    private_key = "0x" + account.PrivateKey().Raw().ToHex()
-    address = account.PublicKey().ToAddress()
+    private_key = "0x" + node.PrivateKey().Raw().ToBytes().hex()
+    address = EthAddrEncoder.EncodeKey(node.PublicKey().KeyObject())
 
     return address, private_key
 
 
-def main():
-    with open(INPUT_FILE, "r", encoding="utf-8") as f:
-        mnemonics = [line.strip() for line in f if line.strip()]
-
-    results = []
-
-    for mnemonic in mnemonics:
-        try:
-            address, private_key = mnemonic_to_evm(mnemonic)
-            results.append(f"{address}|{private_key}")
-        except Exception as e:
-            print(f"助记词解析失败: {mnemonic[:10]}... 错误: {e}")
+def _safe_mnemonic_to_evm(mnemonic: str):
+    # 在子进程中执行：异常转成返回值，单条失败不会中断整个进程池
+    try:
+        return True, mnemonic_to_evm(mnemonic)
+    except Exception as e:
+        return False, str(e)
 
-    with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-        f.write("\n".join(results))
 
-    print(f"完成，共生成 {len(results)} 条，已保存到 {OUTPUT_FILE}")
+def main():
+    # 一次读入整个文件再切行，每行只 strip 一次
+    with open(INPUT_FILE, "r", encoding="utf-8") as f:
+        mnemonics = [m for m in map(str.strip, f.read().splitlines()) if m]
+
+    count = 0
+
+    # 种子生成 (PBKDF2 2048 轮) 和密钥派生都是纯 CPU 计算，按 CPU 核数多进程并行；
+    # map 按输入顺序返回，输出顺序与助记词文件一致。结果边算边写入文件，不在内存中汇总
+    workers = os.cpu_count() or 1
+    chunksize = max(1, len(mnemonics) // (workers * 4))
+    with open(OUTPUT_FILE, "w", encoding="utf-8", buffering=1 << 23) as out, \
+            ProcessPoolExecutor(max_workers=workers) as executor:
+        outcomes = executor.map(_safe_mnemonic_to_evm, mnemonics, chunksize=chunksize)
+        for mnemonic, (ok, payload) in zip(mnemonics, outcomes):
+            if ok:
+                address, private_key = payload
+                out.write(f"{address}|{private_key}\n")
+                count += 1
+            else:
+                print(f"助记词解析失败: {mnemonic[:10]}... 错误: {payload}")
+
+    print(f"完成，共生成 {count} 条，已保存到 {OUTPUT_FILE}")
 
 
 if __name__ == "__main__":
@@ -3,9 +3,13 @@ Opinion SDK WebSocket 客户端模块
 包含 WebSocket 实时数据服务和监控工具
 """
 import asyncio
+import inspect
 import json
-from datetime import datetime
-from typing import Callable
+import queue
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Set, Tuple, Union
 
 try:
     import websockets
@@ -13,23 +17,78 @@ try:
 except ImportError:
     WEBSOCKET_AVAILABLE = False
 
+# orjson (可选)：更快的消息解码，解码失败同样抛出 json.JSONDecodeError 的子类
+_json_loads: Callable[[Union[str, bytes]], Any]
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# uvloop (可选，不支持 Windows)：基于 libuv 的事件循环，接收循环吞吐更高
+try:
+    import uvloop
+    UVLOOP_AVAILABLE = True
+except ImportError:
+    UVLOOP_AVAILABLE = False
+
+
+def run_async(coro):
+    """运行协程直到结束：装有 uvloop 时使用 uvloop 事件循环，否则使用 asyncio 默认循环"""
+    if UVLOOP_AVAILABLE:
+        return uvloop.run(coro)
+    return asyncio.run(coro)
+
+# 消息时间戳 (精确到秒)：同一秒内的消息复用已格式化的字符串，不再每条都 strftime。
+# 缓存是一个不可变的 (秒, 文字) 元组，整体替换，多个线程同时读写也不会拿到不匹配的一对
+_ts_cache: Tuple[int, str] = (-1, "")
+
+
+def _timestamp() -> str:
+    global _ts_cache
+    now = time.time()
+    second = int(now)
+    cached = _ts_cache
+    if second != cached[0]:
+        cached = (second, time.strftime('%H:%M:%S', time.localtime(now)))
+        _ts_cache = cached
+    return cached[1]
+
+
+# 字段值 -> 显示文字 (未命中时取 .get 的默认值)
+_OUTCOME: Dict[Any, str] = {1: 'Yes'}
+_ORDERBOOK_SIDE: Dict[Any, str] = {'bids': '买'}
+_TRADE_SIDE: Dict[Any, str] = {'buy': '买入'}
+
+# 价格是 0-100 的整数分时直接取预先格式化好的文字
+_CENTS = tuple(f"{i}¢" for i in range(101))
+
+
+def _cents(price) -> str:
+    if type(price) is int and 0 <= price <= 100:
+        return _CENTS[price]
+    return f"{price}¢"
+
 
 class OpinionWebSocket:
     """Opinion.trade WebSocket 实时数据服务"""
 
     WS_BASE_URL = "wss://ws.opinion.trade"
 
-    def __init__(self, api_key: str, on_orderbook: Callable = None,
-                 on_trade: Callable = None, on_price: Callable = None):
+    def __init__(self, api_key: str, on_orderbook: Optional[Callable] = None,
+                 on_trade: Optional[Callable] = None, on_price: Optional[Callable] = None,
+                 skip_utf8_validation: bool = False):
         self.api_key = api_key
-        self.ws = None
+        self.ws: Any = None
         self.on_orderbook = on_orderbook
         self.on_trade = on_trade
         self.on_price = on_price
-        self.subscriptions = set()
+        self.skip_utf8_validation = skip_utf8_validation
+        self._recv_kwargs: Dict[str, Any] = {}
+        self.subscriptions: Set[str] = set()
         self.is_connected = False
         self._stop_event = asyncio.Event()
-        self._heartbeat_task = None
+        self._heartbeat_task: Optional[asyncio.Task] = None
 
     async def connect(self) -> bool:
         """建立 WebSocket 连接"""
@@ -46,6 +105,10 @@ class OpinionWebSocket:
                 ping_timeout=10
             )
             self.is_connected = True
+            # 新版 websockets 的 recv(decode=False) 直接返回文本帧的原始字节，
+            # 跳过 UTF-8 解码校验 (消息是 JSON，解析时会再校验一次)
+            if self.skip_utf8_validation and 'decode' in inspect.signature(self.ws.recv).parameters:
+                self._recv_kwargs = {'decode': False}
             # 启动心跳任务
             self._heartbeat_task = asyncio.create_task(self._heartbeat_loop())
             print("✓ WebSocket 已连接")
@@ -56,14 +119,12 @@ class OpinionWebSocket:
 
     async def _heartbeat_loop(self):
         """发送心跳保持连接"""
-        import time
         try:
             while self.is_connected and self.ws:
                 await asyncio.sleep(25)  # 每25秒发送心跳
                 if self.ws and self.is_connected:
                     await self.ws.send(json.dumps({"action": "HEARTBEAT"}))
-                    timestamp = time.strftime("%H:%M:%S")
-                    print(f"  [{timestamp}] 保持连接中...")
+                    print(f"  [{_timestamp()}] 保持连接中...")
         except Exception:
             pass
 
@@ -152,7 +213,7 @@ class OpinionWebSocket:
         try:
             while not self._stop_event.is_set():
                 try:
-                    msg = await asyncio.wait_for(self.ws.recv(), timeout=1.0)
+                    msg = await asyncio.wait_for(self.ws.recv(**self._recv_kwargs), timeout=1.0)
                     await self._handle_message(msg)
                 except asyncio.TimeoutError:
                     continue
@@ -164,10 +225,10 @@ class OpinionWebSocket:
         except Exception as e:
             print(f"WebSocket 接收错误: {e}")
 
-    async def _handle_message(self, msg: str):
+    async def _handle_message(self, msg):
         """处理接收到的消息"""
         try:
-            data = json.loads(msg)
+            data = _json_loads(msg)
             channel = data.get("channel", "")
 
             if channel == "market.depth.diff" and self.on_orderbook:
@@ -186,87 +247,164 @@ class OpinionWebSocket:
 class WebSocketMonitor:
     """WebSocket 实时监控工具"""
 
-    def __init__(self, api_key: str):
+    # 待处理消息队列上限 (输出跟不上时丢弃新消息，不阻塞接收循环)
+    QUEUE_SIZE = 10000
+    # 每次合并写出的最大消息条数
+    WRITE_BATCH = 256
+    # 每批并发发送的订阅请求数
+    SUBSCRIBE_BATCH = 64
+
+    __slots__ = ('api_key', 'skip_utf8_validation', 'ws_service',
+                 'market_titles', '_short_titles', '_work_q')
+
+    def __init__(self, api_key: str, skip_utf8_validation: bool = True):
         self.api_key = api_key
-        self.ws_service = None
-        self.market_titles = {}
+        self.skip_utf8_validation = skip_utf8_validation
+        self.ws_service: Optional[OpinionWebSocket] = None
+        self.market_titles: Dict[int, str] = {}
+        # 消息里显示的短标题 (已截断)，start_monitoring 时预先算好
+        self._short_titles: Dict[Any, str] = {}
+        # 待格式化消息队列，每次 start_monitoring 时换成新的
+        self._work_q: queue.Queue = queue.Queue(maxsize=self.QUEUE_SIZE)
 
     def _format_orderbook_update(self, data: dict) -> str:
         """格式化订单簿更新"""
         market_id = data.get('marketId', '')
-        title = self.market_titles.get(market_id, f'#{market_id}')
+        title = self._short_titles.get(market_id)
+        if title is None:
+            title = f'#{market_id}'[:15]
         side = data.get('side', '')
         price = data.get('price', '')
         size = data.get('size', 0)
-        outcome = 'Yes' if data.get('outcomeSide') == 1 else 'No'
+        outcome = _OUTCOME.get(data.get('outcomeSide'), 'No')
 
-        side_str = '买' if side == 'bids' else '卖'
+        side_str = _ORDERBOOK_SIDE.get(side, '卖')
         action = '新增/更新' if size > 0 else '删除'
 
-        timestamp = datetime.now().strftime('%H:%M:%S')
-        return f"[{timestamp}] 盘口 {title[:15]} | {outcome} {side_str}盘 | {price}¢ x {size} ({action})"
+        return f"[{_timestamp()}] 盘口 {title} | {outcome} {side_str}盘 | {_cents(price)} x {size} ({action})"
 
     def _format_trade_update(self, data: dict) -> str:
         """格式化成交信息"""
         market_id = data.get('marketId', '')
-        title = self.market_titles.get(market_id, f'#{market_id}')
+        title = self._short_titles.get(market_id)
+        if title is None:
+            title = f'#{market_id}'[:15]
         side = data.get('side', '')
         price = data.get('price', '')
         shares = data.get('shares', 0)
-        outcome = 'Yes' if data.get('outcomeSide') == 1 else 'No'
+        outcome = _OUTCOME.get(data.get('outcomeSide'), 'No')
 
-        side_str = '买入' if side == 'buy' else '卖出'
+        side_str = _TRADE_SIDE.get(side, '卖出')
 
-        timestamp = datetime.now().strftime('%H:%M:%S')
-        return f"[{timestamp}] 成交 {title[:15]} | {outcome} {side_str} | {price}¢ x {shares}份"
+        return f"[{_timestamp()}] 成交 {title} | {outcome} {side_str} | {_cents(price)} x {shares}份"
 
     def _format_price_update(self, data: dict) -> str:
         """格式化价格变动"""
         market_id = data.get('marketId', '')
-        title = self.market_titles.get(market_id, f'#{market_id}')
+        title = self._short_titles.get(market_id)
+        if title is None:
+            title = f'#{market_id}'[:15]
         yes_price = data.get('yesPrice', 0)
         no_price = data.get('noPrice', 0)
 
-        timestamp = datetime.now().strftime('%H:%M:%S')
-        return f"[{timestamp}] 价格 {title[:15]} | Yes: {yes_price}¢ | No: {no_price}¢"
+        return f"[{_timestamp()}] 价格 {title} | Yes: {_cents(yes_price)} | No: {_cents(no_price)}"
+
+    # ---- 消息回调 (在事件循环中执行，只入队；队列满时丢弃) ----
+
+    def _on_orderbook(self, data: dict):
+        try:
+            self._work_q.put_nowait((self._format_orderbook_update, data))
+        except queue.Full:
+            pass
 
-    async def start_monitoring(self, market_ids: list, market_titles: dict = None,
+    def _on_trade(self, data: dict):
+        try:
+            self._work_q.put_nowait((self._format_trade_update, data))
+        except queue.Full:
+            pass
+
+    def _on_price(self, data: dict):
+        try:
+            self._work_q.put_nowait((self._format_price_update, data))
+        except queue.Full:
+            pass
+
+    async def start_monitoring(self, market_ids: list, market_titles: Optional[dict] = None,
                                subscribe_orderbook: bool = True,
                                subscribe_trade: bool = True,
                                subscribe_price: bool = True):
         """开始监控"""
         self.market_titles = market_titles or {}
+        self._short_titles = {market_id: f'#{market_id}'[:15] for market_id in market_ids}
+        self._short_titles.update(
+            (market_id, title[:15]) for market_id, title in self.market_titles.items())
 
-        def on_orderbook(data):
-            print(self._format_orderbook_update(data))
-
-        def on_trade(data):
-            print(self._format_trade_update(data))
-
-        def on_price(data):
-            print(self._format_price_update(data))
+        # 回调只把原始消息和对应的格式化函数放进队列，
+        # 格式化和输出都在后台线程里完成，事件循环只负责接收
+        self._work_q = queue.Queue(maxsize=self.QUEUE_SIZE)
+        work_q = self._work_q
 
         self.ws_service = OpinionWebSocket(
             api_key=self.api_key,
-            on_orderbook=on_orderbook if subscribe_orderbook else None,
-            on_trade=on_trade if subscribe_trade else None,
-            on_price=on_price if subscribe_price else None
+            on_orderbook=self._on_orderbook if subscribe_orderbook else None,
+            on_trade=self._on_trade if subscribe_trade else None,
+            on_price=self._on_price if subscribe_price else None,
+            skip_utf8_validation=self.skip_utf8_validation
         )
 
         if not await self.ws_service.connect():
             return
 
-        # 订阅所有市场
+        # 订阅所有市场 (分批并发发送，不逐条等待)
+        pending = []
         for market_id in market_ids:
             if subscribe_orderbook:
-                await self.ws_service.subscribe_orderbook(market_id)
+                pending.append(self.ws_service.subscribe_orderbook(market_id))
             if subscribe_trade:
-                await self.ws_service.subscribe_trade(market_id)
+                pending.append(self.ws_service.subscribe_trade(market_id))
             if subscribe_price:
-                await self.ws_service.subscribe_price(market_id)
+                pending.append(self.ws_service.subscribe_price(market_id))
+        for i in range(0, len(pending), self.SUBSCRIBE_BATCH):
+            await asyncio.gather(*pending[i:i + self.SUBSCRIBE_BATCH])
 
         print(f"\n已订阅 {len(market_ids)} 个市场，按 Ctrl+C 停止监控\n")
         print("-" * 60)
 
         # 开始接收消息
-        await self.ws_service.receive_loop()
+        worker = threading.Thread(target=self._format_worker, args=(work_q,), daemon=True)
+        worker.start()
+        try:
+            await self.ws_service.receive_loop()
+        finally:
+            # 放入结束标记，等待线程输出完剩余的消息
+            await asyncio.to_thread(work_q.put, None)
+            await asyncio.to_thread(worker.join)
+
+    @staticmethod
+    def _write_lines(lines: list):
+        """一次写出多行消息"""
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
+
+    def _format_worker(self, work_q: queue.Queue):
+        """格式化线程：取出已积压的消息 (最多 WRITE_BATCH 条)，格式化后合并为一次写入，
+        收到 None 时输出完手上的消息后退出"""
+        while True:
+            item = work_q.get()
+            lines = []
+            while item is not None:
+                formatter, data = item
+                try:
+                    lines.append(formatter(data))
+                except Exception as e:
+                    lines.append(f"处理消息错误: {e}")
+                if len(lines) >= self.WRITE_BATCH:
+                    break
+                try:
+                    item = work_q.get_nowait()
+                except queue.Empty:
+                    break
+            if lines:
+                self._write_lines(lines)
+            if item is None:
+                return